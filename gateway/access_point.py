@@ -55,10 +55,9 @@ class BleConnectOptions:
 class AccessPoint:
     """ AccessPoint base class """
 
-    # map of addresses to connection handles
-    conn_reqs: dict[str, ConnectionRequest] = {}
-
     def __init__(self, data_producer: DataProducer):
+        # map of addresses to connection handles
+        self.conn_reqs: dict[str, ConnectionRequest] = {}
         self.data_producer = data_producer
         self.ready = threading.Event()
         self.log = logging.getLogger()
@@ -24,11 +24,14 @@ migrate = Migrate()
 
 def create_app(url: str,
                want_ether_mab: Optional[bool] = None,
-               want_fdo: Optional[bool] = None):
+               want_fdo: Optional[bool] = None,
+               engine_options: Optional[dict] = None):
     """ Create Flask Application """
     app = Flask(__name__)
 
     app.config["SQLALCHEMY_DATABASE_URI"] = url
+    if engine_options is not None:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
     app.config['JSON_SORT_KEYS'] = False
 
     if want_ether_mab is None:
@@ -7,6 +7,12 @@ BLE data classes for Service, Characteristic, Descriptor.
 """
 import dataclasses
 
+
+def uuid_key(uuid: str) -> str:
+    """ Normalize a UUID string to the lowercase, undashed hex used as dict key. """
+    return uuid.replace("-", "").lower()
+
+
 @dataclasses.dataclass
 class Service:
     """
@@ -51,6 +51,16 @@ class MockAccessPoint(AccessPoint):
         self.log.info("System booted")
         self.ready.set()
 
+    def reset(self, data_producer: DataProducer):
+        """ Drop connections and subscriptions left over from a previous user
+        and publish through data_producer from now on """
+        subscriptions = self._subscription_threads
+        self._subscription_threads = {}
+        for thread in subscriptions.values():
+            thread.join()
+        self.conn_reqs.clear()
+        self.data_producer = data_producer
+
     def stop(self):
         self.log.info("Stopping...")
         self._scanning = False
@@ -197,7 +207,7 @@ class MockAccessPoint(AccessPoint):
             time.sleep(1)
 
     def disconnect(self, address: str) -> None:
-        """Mock disconnect, always succeeds."""
+        """Mock disconnect, raises BleDisconnectError if the address is not connected."""
         if address not in self.conn_reqs:
             raise BleDisconnectError("not connected")
 
@@ -23,37 +23,28 @@ class ConnectOperation(Operation):
 
     def __init__(self, lib: bgapi.BGLib,
                  data_producer: DataProducer,
-                 address: str,
-                 retries: int):
+                 address: str):
         super().__init__(lib)
         self.handle = 0
         self.address = address.lower()
-        self.retries = retries
         self.data_producer = data_producer
 
     def run(self):
-        """ Connects with retries using specified address type """
+        """ Opens a single connection attempt using specified address type """
         address_type = self.lib.bt.gap.ADDRESS_TYPE_STATIC_ADDRESS  # type: ignore
 
         if self.__is_public_address(self.address):
             address_type = self.lib.bt.gap.ADDRESS_TYPE_PUBLIC_ADDRESS  # type: ignore
 
-        retries = 0
+        # the link layer already retries connection establishment, so a
+        # timeout here is surfaced to the caller instead of retried
+        _, self.handle = self.lib.bt.connection.open(  # type: ignore
+            self.address, address_type, self.lib.bt.gap.PHY_PHY_1M)  # type: ignore
 
-        for _ in range(self.retries + 1):
-            _, self.handle = self.lib.bt.connection.open(  # type: ignore
-                self.address, address_type, self.lib.bt.gap.PHY_PHY_1M)  # type: ignore
-
-            if not self.wait(timeout=CONNECTION_TIMEOUT):
-                retries += 1
-                self.log.warning(
-                    "failed to open connection to %s", self.address)
-                self.lib.bt.connection.close(self.handle)  # type: ignore
-            else:
-                break
-
-        # Reached max retries and failed to open connection
-        if retries == self.retries + 1:
+        if not self.wait(timeout=CONNECTION_TIMEOUT):
+            self.log.warning(
+                "failed to open connection to %s", self.address)
+            self.lib.bt.connection.close(self.handle)  # type: ignore
             self.is_done = True
 
     def bt_evt_connection_opened(self, evt):
@@ -10,9 +10,11 @@ along with an operation for discovering these attributes in BLE devices.
 
 """
 
+import string
+
 from silabs.ble_operations.operation import Operation
-from ble_types import Service, Characteristic, Descriptor
-from access_point_responses import DiscoverResponse
+from ble_types import Service, Characteristic, Descriptor, uuid_key
+from access_point_responses import BleDiscoveryError, DiscoverResponse
 
 
 class DiscoverOperation(Operation):
@@ -22,22 +24,37 @@ class DiscoverOperation(Operation):
     current_characteristic: Characteristic
     result: int
 
-    def __init__(self, lib, handle: int, retries: int = 3, services: list[dict[str, str]] = None):
+    def __init__(self, lib, handle: int, services: list[str | dict[str, str]] = None):
         super().__init__(lib)
         self.handle = handle
         self.requested_services = services
-        self.retries = retries
         self.services: dict[str, Service] = {}
 
     def run(self):
         """ run function """
-        self.lib.bt.gatt.discover_primary_services(self.handle)  # type: ignore
+        if self.requested_services:
+            # Only one GATT procedure may be outstanding per connection, so
+            # narrow the search to the requested services instead of walking
+            # every characteristic and descriptor of the whole database.
+            for service_id in self._requested_service_ids():
+                self.lib.bt.gatt.discover_primary_services_by_uuid(  # type: ignore
+                    self.handle, bytes.fromhex(service_id)[::-1])
 
-        self.wait()
+                self.wait()
 
-        if self.result != 0:
-            self.log.error("failed to discover services: %d", self.result)
-            return
+                if self.result != 0:
+                    # e.g. the device does not have this service; still walk
+                    # the services that were found
+                    self.log.warning(
+                        "failed to discover service %s: %d", service_id, self.result)
+        else:
+            self.lib.bt.gatt.discover_primary_services(self.handle)  # type: ignore
+
+            self.wait()
+
+            if self.result != 0:
+                self.log.error("failed to discover services: %d", self.result)
+                return
 
         for service in self.services.values():
             self.lib.bt.gatt.discover_characteristics(  # type: ignore
@@ -95,11 +112,27 @@ class DiscoverOperation(Operation):
             self.set()
             self.clear()
 
+    def _requested_service_ids(self) -> list[str]:
+        """ Normalizes the requested service UUIDs to the discovered key format.
+
+        Services may be given as UUID strings or as {"serviceID": ...} dicts.
+        Raises BleDiscoveryError for a UUID that isn't an even number of hex
+        digits, since it can't be sent to the device.
+        """
+        service_ids = [uuid_key(service if isinstance(service, str) else service["serviceID"])
+                       for service in self.requested_services]
+        for service_id in service_ids:
+            if (not service_id or len(service_id) % 2
+                    or not set(service_id) <= set(string.hexdigits)):
+                raise BleDiscoveryError(f"invalid service UUID: {service_id!r}")
+        return service_ids
+
     def response(self):
         """ Returns a DiscoverResponse with the discovered services. """
         # Only include requested services if specified
         if self.requested_services:
-            services = [s for s in self.services.values() if s.service_id in self.requested_services]
+            requested = self._requested_service_ids()
+            services = [s for s in self.services.values() if s.service_id in requested]
         else:
             services = list(self.services.values())
         return DiscoverResponse(address=str(self.handle), services=services)
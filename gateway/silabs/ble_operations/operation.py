@@ -9,17 +9,63 @@ Class for background operations handling events and generating responses.
 
 """
 
+import dataclasses
 import logging
 import threading
+from typing import Callable, Optional
 import bgapi
 
+from data_producer import DataProducer
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OpContext:
+    """ Connection and characteristic an operation acts on. """
+    lib: bgapi.BGLib
+    handle: int
+    char_handle: int
+    address: Optional[str] = None
+    service_uuid: Optional[str] = None
+    char_uuid: Optional[str] = None
+    data_producer: Optional[DataProducer] = None
+    properties: tuple[str, ...] = ()
+
+
+def _ignore_done(_operation: "Operation"):
+    """ Default done_callback of an operation nobody retires. """
+
+
 class Operation(threading.Event):
     """ class for handling Bluetooth operations with response generation. """
+
+    log = logging.getLogger()
+
+    # event name -> bt_evt_* function, built once per subclass
+    _event_handlers: dict[str, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._event_handlers = {
+            name: getattr(cls, name) for name in dir(cls) if name.startswith("bt_evt_")
+        }
+
     def __init__(self, lib: bgapi.BGLib):
         super().__init__()
         self.lib = lib
-        self.is_done = False
-        self.log = logging.getLogger()
+        self._is_done = False
+        # called once the operation is done, set by whoever runs it
+        self.done_callback: Callable[["Operation"], None] = _ignore_done
+
+    @property
+    def is_done(self) -> bool:
+        """ True once the operation no longer needs BLE events """
+        return self._is_done
+
+    @is_done.setter
+    def is_done(self, value: bool):
+        self._is_done = value
+        if value:
+            self.done_callback(self)
 
     def run(self):
         """ run function """
@@ -27,9 +73,9 @@ class Operation(threading.Event):
 
     def handle_event(self, evt):
         """ handle_event function """
-        event_callback = getattr(self, evt._str, None)  # pylint: disable=protected-access
+        event_callback = self._event_handlers.get(evt._str)  # pylint: disable=protected-access
         if event_callback is not None:
-            event_callback(evt)
+            event_callback(self, evt)
 
     def response(self):
         """ Returns a response object for the operation. """
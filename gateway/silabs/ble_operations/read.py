@@ -10,8 +10,7 @@ handling responses, and generating success or failure messages.
 
 """
 
-import bgapi
-from silabs.ble_operations.operation import Operation
+from silabs.ble_operations.operation import OpContext, Operation
 from access_point_responses import ReadResponse
 
 
@@ -19,24 +18,23 @@ class ReadOperation(Operation):
     """ ReadOperation class for reading a BLE characteristic with response generation. """
     value: bytes
 
-    def __init__(self, lib: bgapi.BGLib, handle: int, char_handle: int):
-        super().__init__(lib)
-        self.handle = handle
-        self.char_handle = char_handle
+    def __init__(self, ctx: OpContext):
+        super().__init__(ctx.lib)
+        self.ctx = ctx
 
     def run(self):
         """ run function """
         self.log.info(
-            "reading characteristic %d from %d", self.char_handle, self.handle)
+            "reading characteristic %d from %d", self.ctx.char_handle, self.ctx.handle)
         self.lib.bt.gatt.read_characteristic_value(  # type: ignore
-            self.handle, self.char_handle)
+            self.ctx.handle, self.ctx.char_handle)
 
         self.wait()
 
     def bt_evt_gatt_characteristic_value(self, evt):
         """ Handles BLE characteristic value events, setting the value. """
-        if self.handle == evt.connection and \
-                self.char_handle == evt.characteristic and \
+        if self.ctx.handle == evt.connection and \
+                self.ctx.char_handle == evt.characteristic and \
                 evt.att_opcode == self.lib.bt.gatt.ATT_OPCODE_READ_RESPONSE:  # type: ignore
             self.log.info(evt)
             self.value = evt.value
@@ -44,14 +42,14 @@ class ReadOperation(Operation):
 
     def bt_evt_gatt_procedure_completed(self, evt):
         """ Handles BLE procedure completion events, marking the operation as done. """
-        if self.handle == evt.connection:
+        if self.ctx.handle == evt.connection:
             self.log.info(evt)
             self.is_done = True
 
     def response(self):
         if self.is_set():
-            return ReadResponse(address=str(self.handle), service_uuid="", char_uuid="", value=self.value)
-        return ReadResponse(address=str(self.handle), service_uuid="", char_uuid="", value=None)
+            return ReadResponse(address=str(self.ctx.handle), service_uuid="", char_uuid="", value=self.value)
+        return ReadResponse(address=str(self.ctx.handle), service_uuid="", char_uuid="", value=None)
 
     def __repr__(self):
-        return f"ReadOperation({self.handle})"
+        return f"ReadOperation({self.ctx.handle})"
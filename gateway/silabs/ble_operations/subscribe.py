@@ -12,91 +12,75 @@ notifications/indications, forwarding data, and managing notifications.
 
 from http import HTTPStatus
 import uuid
-import bgapi
 from flask import Response, jsonify
 
-from silabs.ble_operations.operation import Operation
-from data_producer import DataProducer
+from silabs.ble_operations.operation import OpContext, Operation
 from access_point_responses import SubscribeResponse
 
 
 class SubscribeOperation(Operation):
     """ Handles subscribing to a BLE characteristic, handling notifications and indications. """
 
-    def __init__(self,
-                 lib: bgapi.BGLib,
-                 handle: int,
-                 char_handle: int,
-                 properties: list[str],
-                 address: str,
-                 service_uuid: str,
-                 char_uuid: str,
-                 data_producer: DataProducer):
-        super().__init__(lib)
-        self.handle = handle
-        self.char_handle = char_handle
-        self.properties = properties
-        self.address = address
-        self.service_uuid = service_uuid
-        self.char_uuid = char_uuid
-        self.data_producer = data_producer
+    def __init__(self, ctx: OpContext):
+        super().__init__(ctx.lib)
+        self.ctx = ctx
         self.__disable = False
 
     def run(self):
         """ run Function """
         self.log.info(
-            "subscribe to characteristic %d from %d", self.char_handle, self.handle)
+            "subscribe to characteristic %d from %d", self.ctx.char_handle, self.ctx.handle)
 
-        if "notify" in self.properties:
+        if "notify" in self.ctx.properties:
             flag = self.lib.bt.gatt.CLIENT_CONFIG_FLAG_NOTIFICATION
-        elif "indicate" in self.properties:
+        elif "indicate" in self.ctx.properties:
             flag = self.lib.bt.gatt.CLIENT_CONFIG_FLAG_INDICATION
         else:
             self.log.error("No notify or indicate property")
             return
 
         self.lib.bt.gatt.set_characteristic_notification(
-            self.handle, self.char_handle, flag)
+            self.ctx.handle, self.ctx.char_handle, flag)
 
         self.wait()
 
     def bt_evt_gatt_characteristic_value(self, evt):
         """ Processes characteristic value notifications/indications. """
-        if self.handle == evt.connection and \
-                self.char_handle == evt.characteristic and \
+        if self.ctx.handle == evt.connection and \
+                self.ctx.char_handle == evt.characteristic and \
                 evt.att_opcode in (self.lib.bt.gatt.ATT_OPCODE_HANDLE_VALUE_NOTIFICATION,
                                    self.lib.bt.gatt.ATT_OPCODE_HANDLE_VALUE_INDICATION):
             self.log.info(evt)
             if evt.att_opcode == self.lib.bt.gatt.ATT_OPCODE_HANDLE_VALUE_INDICATION:
                 try:
                     self.lib.bt.gatt.send_characteristic_confirmation(
-                        self.handle)
+                        self.ctx.handle)
                 except ImportError as error_exp:
                     self.log.error(error_exp)
                     # TODO: Why does this happen?
-            self.data_producer.publish_notification(
-                self.address, self.service_uuid, self.char_uuid, evt.value)
+            self.ctx.data_producer.publish_notification(
+                self.ctx.address, self.ctx.service_uuid, self.ctx.char_uuid, evt.value)
 
     def disable_notification(self):
         """ Disables notifications/indications for the characteristic. """
         self.clear()
         self.__disable = True
         self.lib.bt.gatt.set_characteristic_notification(
-            self.handle, self.char_handle, self.lib.bt.gatt.CLIENT_CONFIG_FLAG_DISABLE)
+            self.ctx.handle, self.ctx.char_handle, self.lib.bt.gatt.CLIENT_CONFIG_FLAG_DISABLE)
 
         self.wait()
 
     def bt_evt_gatt_procedure_completed(self, evt):
         """ Handles procedure completion events and sets the operation's state. """
-        if self.handle == evt.connection:
+        if self.ctx.handle == evt.connection:
             self.set()
             if self.__disable:
                 self.is_done = True
 
     def response(self):
         if self.is_set():
-            return SubscribeResponse(address=self.address, service_uuid=self.service_uuid, char_uuid=self.char_uuid, subscribed=True)
-        return SubscribeResponse(address=self.address, service_uuid=self.service_uuid, char_uuid=self.char_uuid, subscribed=False)
+            return SubscribeResponse(address=self.ctx.address, service_uuid=self.ctx.service_uuid, char_uuid=self.ctx.char_uuid, subscribed=True)
+        return SubscribeResponse(address=self.ctx.address, service_uuid=self.ctx.service_uuid, char_uuid=self.ctx.char_uuid, subscribed=False)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self.handle})"
+        return f"{self.__class__.__name__}({self.ctx.handle})"
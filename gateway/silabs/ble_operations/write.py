@@ -11,38 +11,36 @@ responses.
 
 """
 
-import bgapi
-from silabs.ble_operations.operation import Operation
+from silabs.ble_operations.operation import OpContext, Operation
 from access_point_responses import WriteResponse
 
 
 class WriteOperation(Operation):
     """ Handles writing a value to a BLE characteristic. """
 
-    def __init__(self, lib: bgapi.BGLib, handle: int, char_handle: int, value: bytes):
-        super().__init__(lib)
-        self.handle = handle
-        self.char_handle = char_handle
+    def __init__(self, ctx: OpContext, value: bytes):
+        super().__init__(ctx.lib)
+        self.ctx = ctx
         self.value_bytes = value
 
     def run(self):
         self.log.info(
-            "writing characteristic %d from %d", self.char_handle, self.handle)
+            "writing characteristic %d from %d", self.ctx.char_handle, self.ctx.handle)
         self.lib.bt.gatt.write_characteristic_value(  # type: ignore
-            self.handle, self.char_handle, self.value_bytes)
+            self.ctx.handle, self.ctx.char_handle, self.value_bytes)
 
         self.wait()
 
     def bt_evt_gatt_procedure_completed(self, evt):
-        if self.handle == evt.connection:
+        if self.ctx.handle == evt.connection:
             self.log.info(evt)
             self.set()
             self.is_done = True
 
     def response(self):
         if self.is_set():
-            return WriteResponse(address=str(self.handle), service_uuid="", char_uuid="", value=self.value_bytes, success=True)
-        return WriteResponse(address=str(self.handle), service_uuid="", char_uuid="", value=None, success=False)
+            return WriteResponse(address=str(self.ctx.handle), service_uuid="", char_uuid="", value=self.value_bytes, success=True)
+        return WriteResponse(address=str(self.ctx.handle), service_uuid="", char_uuid="", value=None, success=False)
 
     def __repr__(self):
-        return f"WriteOperation({self.handle})"
+        return f"WriteOperation({self.ctx.handle})"
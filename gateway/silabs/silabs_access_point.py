@@ -7,16 +7,20 @@
 Silabs Access Point class
 """
 
+import threading
+from typing import Callable
+
 from data_producer import DataProducer
 from silabs.ble_operations.connect import ConnectOperation
 from silabs.ble_operations.disconnect import DisconnectOperation
 from silabs.ble_operations.discover import DiscoverOperation
-from silabs.ble_operations.operation import Operation
+from silabs.ble_operations.operation import OpContext, Operation
 from silabs.ble_operations.read import ReadOperation
 from silabs.ble_operations.scan import ScanOperation
 from silabs.ble_operations.subscribe import SubscribeOperation
 from silabs.ble_operations.write import WriteOperation
 from silabs.common.util import BluetoothApp
+from ble_types import uuid_key
 from config import SL_BT_CONFIG_MAX_CONNECTIONS
 from access_point import AccessPoint, BleConnectOptions, ConnectionRequest
 from access_point_responses import BleConnectionError, BleDisconnectError, BleDiscoveryError, BleReadError, BleSubscribeError, BleUnsubscribeError, BleWriteError, DiscoverResponse, ReadResponse, SubscribeResponse, UnsubscribeResponse, WriteResponse
@@ -24,12 +28,19 @@ from access_point_responses import BleConnectionError, BleDisconnectError, BleDi
 class SilabsAccessPoint(AccessPoint):
     """ Manages Bluetooth Low Energy (BLE) operations and connections."""
 
-    operations: list[Operation] = []
-
     def __init__(self, connector, data_producer: DataProducer):
         super().__init__(data_producer)
+        self.operations: list[Operation] = []
         self.silabs_app = BluetoothApp(connector)
         self.silabs_app.event_handler = self.event_handler
+        # bound handle_event methods, kept in step with self.operations
+        self._op_handlers: list[Callable] = []
+        self._ops_lock = threading.Lock()
+        # open connections, maintained alongside conn_reqs for connectable()
+        self._max_conn = SL_BT_CONFIG_MAX_CONNECTIONS
+        self._n_conn = 0
+        # address -> (service uuid, char uuid) -> context, until rediscovery or close
+        self._contexts: dict[str, dict[tuple[str, str], OpContext]] = {}
 
     def start(self):
         """ Start the Bluetooth application """
@@ -41,69 +52,105 @@ class SilabsAccessPoint(AccessPoint):
 
     def connectable(self):
         """ Check if new connections can be established """
-        return len(self.conn_reqs) < SL_BT_CONFIG_MAX_CONNECTIONS
+        return self._n_conn < self._max_conn
+
+    def _add_operation(self, operation: Operation):
+        """ Register an operation to receive BLE events """
+        operation.done_callback = self._retire_operation
+        with self._ops_lock:
+            self.operations.append(operation)
+            self._op_handlers.append(operation.handle_event)
+
+    def _characteristic_context(self, address: str, service_uuid: str, char_uuid: str,
+                                error: type[Exception]) -> OpContext:
+        """ Resolve the operation context for a characteristic, raising error if not connected """
+        contexts = self._contexts.get(address)
+        if contexts is not None:
+            ctx = contexts.get((service_uuid, char_uuid))
+            if ctx is not None:
+                return ctx
+
+        conn_req = self.conn_reqs.get(address)
+        if conn_req is None:
+            raise error("not connected")
+
+        service = conn_req.services[uuid_key(service_uuid)]
+        characteristic = service.characteristics[uuid_key(char_uuid)]
+
+        ctx = OpContext(self.silabs_app.lib, conn_req.handle, characteristic.char_handle,
+                        address, service_uuid, char_uuid, self.data_producer,
+                        tuple(characteristic.properties))
+        self._contexts.setdefault(address, {})[(service_uuid, char_uuid)] = ctx
+        return ctx
+
+    def _retire_operation(self, operation: Operation):
+        """ Stop dispatching BLE events to a finished operation """
+        with self._ops_lock:
+            if operation not in self.operations:
+                return
+            index = self.operations.index(operation)
+            # replace rather than mutate, event_handler may be iterating
+            self.operations = self.operations[:index] + self.operations[index + 1:]
+            self._op_handlers = self._op_handlers[:index] + self._op_handlers[index + 1:]
 
     def start_scan(self):
         """ Start scanning for devices """
         scan_operation = ScanOperation(self.silabs_app.lib, self.data_producer)
-        self.operations.append(scan_operation)
+        self._add_operation(scan_operation)
         scan_operation.run()
 
     def connect(self,
                 address: str,
                 ble_connect_options: BleConnectOptions,
-                retries: int = 3) -> None:
-        """ Establish a connection to a BLE device """
+                _retries: int = 3) -> None:
+        """
+        Establish a connection to a BLE device. Connection attempts are
+        retried by the link layer, so a single attempt is made here.
+        """
         if not self.connectable():
             raise BleConnectionError("max connections")
         if address in self.conn_reqs:
             raise BleConnectionError("already connected")
         operation = ConnectOperation(
-            self.silabs_app.lib, self.data_producer, address, retries)
-        self.operations.append(operation)
+            self.silabs_app.lib, self.data_producer, address)
+        self._add_operation(operation)
         operation.run()
 
         if not operation.is_set():
             raise BleConnectionError("connection operation failed")
         else:
             self.conn_reqs[address] = ConnectionRequest(address, operation.handle, {})
+            self._n_conn += 1
 
     def discover(self,
                  address: str,
                  ble_connect_options: BleConnectOptions,
-                 retries: int = 3) -> DiscoverResponse:
+                 _retries: int = 3) -> DiscoverResponse:
         """ Discover services of a connected BLE device """
-        if address not in self.conn_reqs:
+        conn_req = self.conn_reqs.get(address)
+        if conn_req is None:
             raise BleDiscoveryError("not connected")
 
         discover_operation = DiscoverOperation(
             self.silabs_app.lib,
-            self.conn_reqs[address].handle,
-            retries,
+            conn_req.handle,
             ble_connect_options.services
         )
-        self.operations.append(discover_operation)
+        self._add_operation(discover_operation)
 
         discover_operation.run()
 
-        self.conn_reqs[address].services = discover_operation.services
+        conn_req.services = discover_operation.services
+        self._contexts.pop(address, None)
 
         return DiscoverResponse(address=address, services=discover_operation.services)
 
     def read(self, address: str, service_uuid: str, char_uuid: str) -> ReadResponse:
         """ Read a characteristic from a connected BLE device """
-        if address not in self.conn_reqs:
-            raise BleReadError("not connected")
-
-        conn_req = self.conn_reqs[address]
-        handle = conn_req.handle
-
-        service = conn_req.services[service_uuid]
-        characteristic = service.characteristics[char_uuid]
+        ctx = self._characteristic_context(address, service_uuid, char_uuid, BleReadError)
 
-        operation = ReadOperation(
-            self.silabs_app.lib, handle, characteristic.char_handle)
-        self.operations.append(operation)
+        operation = ReadOperation(ctx)
+        self._add_operation(operation)
         operation.run()
 
         return operation.response()
@@ -114,18 +161,10 @@ class SilabsAccessPoint(AccessPoint):
               char_uuid: str,
               value: bytes) -> WriteResponse:
         """ Write a value to a characteristic of a connected BLE device """
-        if address not in self.conn_reqs:
-            raise BleWriteError("not connected")
+        ctx = self._characteristic_context(address, service_uuid, char_uuid, BleWriteError)
 
-        conn_req = self.conn_reqs[address]
-        handle = conn_req.handle
-
-        service = conn_req.services[service_uuid]
-        characteristic = service.characteristics[char_uuid]
-
-        operation = WriteOperation(
-            self.silabs_app.lib, handle, characteristic.char_handle, value)
-        self.operations.append(operation)
+        operation = WriteOperation(ctx, value)
+        self._add_operation(operation)
         operation.run()
 
         # Assume success for now
@@ -133,22 +172,10 @@ class SilabsAccessPoint(AccessPoint):
 
     def subscribe(self, address: str, service_uuid: str, char_uuid: str) -> SubscribeResponse:
         """ Subscribe to notifications from a characteristic of a connected BLE device """
-        if address not in self.conn_reqs:
-            raise BleSubscribeError("not connected")
-
-        conn_req = self.conn_reqs[address]
-        handle = conn_req.handle
-
-        service = conn_req.services[service_uuid]
-        characteristic = service.characteristics[char_uuid]
+        ctx = self._characteristic_context(address, service_uuid, char_uuid, BleSubscribeError)
 
-        operation = SubscribeOperation(
-            self.silabs_app.lib, handle, characteristic.char_handle, characteristic.properties,
-            address,
-            service_uuid,
-            char_uuid,
-            self.data_producer)
-        self.operations.append(operation)
+        operation = SubscribeOperation(ctx)
+        self._add_operation(operation)
         operation.run()
 
         # Assume success for now
@@ -156,20 +183,15 @@ class SilabsAccessPoint(AccessPoint):
 
     def unsubscribe(self, address: str, service_uuid: str, char_uuid: str) -> UnsubscribeResponse:
         """ Unsubscribe from notifications from a characteristic of a connected BLE device """
-        if address not in self.conn_reqs:
-            raise BleUnsubscribeError("not connected")
-
-        conn_req = self.conn_reqs[address]
-        handle = conn_req.handle
-
-        service = conn_req.services[service_uuid]
-        characteristic = service.characteristics[char_uuid]
+        ctx = self._characteristic_context(address, service_uuid, char_uuid, BleUnsubscribeError)
 
         # find the subscription operation
         for operation in self.operations:
-            charhandle_match = operation.char_handle == characteristic.char_handle
-            chk_handle = operation.handle == handle
-            if isinstance(operation, SubscribeOperation) and chk_handle and charhandle_match:
+            if not isinstance(operation, SubscribeOperation):
+                continue
+            charhandle_match = operation.ctx.char_handle == ctx.char_handle
+            chk_handle = operation.ctx.handle == ctx.handle
+            if chk_handle and charhandle_match:
                 operation.disable_notification()
                 return UnsubscribeResponse(address=address, service_uuid=service_uuid, char_uuid=char_uuid, unsubscribed=True)
 
@@ -177,10 +199,13 @@ class SilabsAccessPoint(AccessPoint):
 
     def disconnect(self, address: str) -> None:
         """ Disconnect a device. Raises DisconnectError. """
-        handle = self.conn_reqs[address].handle
+        conn_req = self.conn_reqs.get(address)
+        if conn_req is None:
+            raise BleDisconnectError("not connected")
+        handle = conn_req.handle
 
         operation = DisconnectOperation(self.silabs_app.lib, handle)
-        self.operations.append(operation)
+        self._add_operation(operation)
         operation.run()
 
         if not operation.is_set():
@@ -196,19 +221,15 @@ class SilabsAccessPoint(AccessPoint):
         for address, conn_req in self.conn_reqs.items():
             if conn_req.handle == evt.connection:
                 self.conn_reqs.pop(address)
+                self._contexts.pop(address, None)
+                self._n_conn -= 1
                 break
 
     def event_handler(self, evt):
         """ function to define actions based on different events """
-        remove_ops: list[Operation] = []
-
-        for operation in self.operations:
-            operation.handle_event(evt)
-            if operation.is_done:
-                remove_ops.append(operation)
-
-        for operation in remove_ops:
-            self.operations.remove(operation)
+        # finished operations retire themselves via done_callback
+        for handle_event in self._op_handlers:
+            handle_event(evt)
 
         event_callback = getattr(
             self, evt._str, None)  # pylint: disable=protected-access
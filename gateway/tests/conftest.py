@@ -5,50 +5,223 @@ Centralize shared fixtures and enable optional SCIM extensions via create_app
 options, without relying on environment-variable import ordering.
 """
 
+import datetime
 import os
+import time
 import uuid
+from typing import Callable
 
+import docker
+import docker.errors
 import paho.mqtt.client as mqtt
 import pytest
 from flask import Flask
 from flask.testing import FlaskClient
 from paho.mqtt.enums import CallbackAPIVersion
+from sqlalchemy import delete, text
+from sqlalchemy.exc import OperationalError
 from testcontainers.postgres import PostgresContainer
 
 from app_factory import create_app
 from data_producer import DataProducer
 from database import db
-from models import OnboardingAppKey
-from nipc_models import SdfModel
+from models import Device, EndpointApp, OnboardingAppKey
+from nipc_models import BleExtension, SdfModel
 from tests.mosquitto_container import MosquittoContainer
+from util import make_hash
 
 
-@pytest.fixture(name="postgres")
-def fixture_postgres():
-    """Postgres container."""
-    with PostgresContainer("postgres:13.1") as postgres_container:
-        yield postgres_container
+_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_MOSQUITTO_CONF = os.path.join(_TESTS_DIR, "mosquitto.conf")
 
+_THERMOMETER_SDF_MODEL = {
+    "namespace": {"tm": "https://example.com/thermometer"},
+    "sdfThing": {
+        "thermometer": {
+            "sdfProperty": {
+                "temperature": {
+                    "type": "number",
+                    "minimum": -40,
+                    "maximum": 125,
+                    "unit": "Cel",
+                    "writable": False,
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "serviceID": "180d",
+                            "characteristicID": "2a38"
+                        }
+                    }
+                },
+                "temperature_control": {
+                    "type": "number",
+                    "minimum": -40,
+                    "maximum": 125,
+                    "unit": "Cel",
+                    "writable": True,
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "serviceID": "180d",
+                            "characteristicID": "2a39"
+                        }
+                    }
+                },
+                "humidity": {
+                    "type": "number",
+                    "minimum": 0,
+                    "maximum": 100,
+                    "unit": "%",
+                    "writable": False,
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "serviceID": "180d",
+                            "characteristicID": "2a38"
+                        }
+                    }
+                }
+            },
+            "sdfEvent": {
+                "isPresent": {
+                    "description": "BLE advertisements",
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "type": "advertisements"
+                        }
+                    }
+                },
+                "isConnected": {
+                    "description": "BLE connection event",
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "type": "connection_events"
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
 
-@pytest.fixture(name="app")
-def fixture_app(postgres: PostgresContainer):
-    """Flask application."""
+
+# Postgres image for the test container. Point this at an image with the
+# schema already applied to skip the DDL; create_all() leaves existing tables.
+_POSTGRES_IMAGE = os.environ.get("TIEDIE_TEST_POSTGRES_IMAGE", "postgres:13.1")
+
+_MOSQUITTO_IMAGE = "eclipse-mosquitto:latest"
+
+# endpoint apps created by module-scoped fixtures, kept by per-test cleanup
+_MODULE_ENDPOINT_APPS: set[uuid.UUID] = set()
+
+
+# fixtures that start or need a container
+_CONTAINER_FIXTURES = {"database_url", "mosquitto"}
+
+
+def pytest_configure(config: pytest.Config):
+    """Register the markers used by the gateway tests."""
+    config.addinivalue_line(
+        "markers", "integration: needs the Postgres or Mosquitto containers")
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]):
+    """Mark every test that depends on a container as an integration test,
+    so a quick local run can deselect them with -m "not integration"."""
+    for item in items:
+        if _CONTAINER_FIXTURES & set(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.integration)
+
+
+def _ensure_image(image: str):
+    """Pull a missing container image before its container starts,
+    so the pull isn't charged to the container's startup timeout."""
+    client = docker.from_env()
+    try:
+        client.images.get(image)
+    except docker.errors.ImageNotFound:
+        client.images.pull(image)
+
+
+@pytest.fixture(name="database_url", scope="session")
+def fixture_database_url(request: pytest.FixtureRequest):
+    """Postgres database URL, shared by the whole test session.
+
+    TIEDIE_TEST_DATABASE_URL points the tests at an already running server
+    and skips the container. Its tables are emptied after every test, and
+    it is used as is by all pytest-xdist workers, so don't combine it with -n.
+
+    Otherwise every pytest-xdist worker runs its own session, so each one
+    gets a container with a database named after the worker.
+    """
+    database_url = os.environ.get("TIEDIE_TEST_DATABASE_URL")
+    if database_url:
+        yield database_url
+        return
+
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid", "gw0")
+    _ensure_image(_POSTGRES_IMAGE)
+    with PostgresContainer(_POSTGRES_IMAGE, dbname=f"test_{worker_id}").with_command(
+            "postgres -c max_connections=300 -c shared_buffers=256MB") as postgres_container:
+        yield postgres_container.get_connection_url()
+
+
+@pytest.fixture(name="app_session", scope="session")
+def fixture_app_session(database_url: str):
+    """Flask application and database schema, created once per session."""
     app = create_app(
-        postgres.get_connection_url(),
+        database_url,
         want_ether_mab=True,
         want_fdo=True,
+        # bounded pool for the many requests of a test session; stale
+        # connections are replaced instead of failing a test
+        engine_options={
+            "pool_size": 20,
+            "max_overflow": 10,
+            "pool_pre_ping": True,
+            "pool_recycle": 300,
+        },
     )
 
+    # the container can report started before Postgres accepts connections
     with app.app_context():
-        db.create_all()
+        for attempt in range(10):
+            try:
+                db.create_all()
+                break
+            except OperationalError:
+                if attempt == 9:
+                    raise
+                db.session.remove()
+                time.sleep(0.5)
 
     yield app
 
 
+@pytest.fixture(name="app")
+def fixture_app(app_session: Flask):
+    """Flask application, emptied of all rows after each test."""
+    yield app_session
+
+    # sdf_model and module endpoint_app rows are owned by module-scoped fixtures
+    kept_tables = (SdfModel.__tablename__, EndpointApp.__tablename__)
+    with app_session.app_context():
+        tables = ", ".join(f'"{table.name}"' for table in db.metadata.sorted_tables
+                           if table.name not in kept_tables)
+        db.session.execute(text(f"TRUNCATE TABLE {tables} CASCADE"))
+        db.session.execute(delete(EndpointApp).where(
+            EndpointApp.id.not_in(list(_MODULE_ENDPOINT_APPS))))
+        db.session.commit()
+        db.session.remove()
+
+
+@pytest.fixture(name="module_client", scope="module")
+def fixture_module_client(app_session: Flask) -> FlaskClient:
+    """Flask client, shared by the tests of a module."""
+    return app_session.test_client()
+
+
 @pytest.fixture(name="client")
-def fixture_client(app: Flask) -> FlaskClient:
-    """Flask client."""
-    return app.test_client()
+def fixture_client(app: Flask, module_client: FlaskClient) -> FlaskClient:  # pylint: disable=unused-argument
+    """Flask client, with the per-test database cleanup of the app fixture."""
+    return module_client
 
 
 @pytest.fixture(name="api_key")
@@ -62,20 +235,20 @@ def fixture_api_key(app):
         yield key
 
 
-@pytest.fixture(name="mosquitto")
+@pytest.fixture(name="mosquitto", scope="session")
 def fixture_mosquitto():
-    """Mosquitto container."""
-    path = os.path.abspath(os.path.dirname(__file__))
-    with MosquittoContainer(volume_mappings=[
-        (path + "/mosquitto.conf", "/mosquitto/config/mosquitto.conf"),
+    """Mosquitto container, shared by the whole test session."""
+    _ensure_image(_MOSQUITTO_IMAGE)
+    with MosquittoContainer(image=_MOSQUITTO_IMAGE, volume_mappings=[
+        (_MOSQUITTO_CONF, "/mosquitto/config/mosquitto.conf"),
     ]) as m_container:
         yield m_container
 
 
-@pytest.fixture(name="mqtt_client")
+@pytest.fixture(name="mqtt_client", scope="session")
 def fixture_mqtt_client(mosquitto: MosquittoContainer):
-    """MQTT client."""
-    client = mqtt.Client(CallbackAPIVersion.VERSION2)
+    """MQTT client used for publishing, connected once per session."""
+    client = mqtt.Client(CallbackAPIVersion.VERSION2, client_id=f"test-{uuid.uuid4()}")
     client.connect(mosquitto.get_container_host_ip(),
                    int(mosquitto.get_exposed_port(1883)), 60)
     client.loop_start()
@@ -90,120 +263,111 @@ def fixture_data_producer(mqtt_client: mqtt.Client, app: Flask):
     yield DataProducer(mqtt_client, app)
 
 
-@pytest.fixture(name="control_api_key")
-def fixture_control_api_key(client: FlaskClient, api_key: str):
-    """Create control app and return API key."""
-    response = client.post(
-        "/scim/v2/EndpointApps",
-        json={
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
-            "applicationType": "deviceControl",
-            "applicationName": "Device Control App 1",
-        },
-        headers={
-            "x-api-key": api_key
-        }
-    )
+@pytest.fixture(name="device_factory")
+def fixture_device_factory(app: Flask) -> Callable[[], dict]:
+    """Insert BLE devices straight into the database, bypassing SCIM."""
+    def create_device(mac_address: str = "AA:BB:CC:11:22:33") -> dict:
+        with app.app_context():
+            device = Device(
+                schemas=["urn:ietf:params:scim:schemas:core:2.0:Device",
+                         "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
+                display_name="BLE Heart Monitor",
+                active=True,
+                endpoint_apps=None,
+                created_time=datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+            )
+            device.device_id = uuid.uuid4()
+            device.ble_extension = BleExtension(
+                device_id=device.device_id,
+                device_mac_address=mac_address,
+                version_support=["5.3"],
+                is_random=False,
+                separate_broadcast_address=[],
+                irk="",
+                pairing_methods=[],
+                pairing_null=None,
+                pairing_just_works_keys=None,
+                pairing_pass_key=None,
+                pairing_oob_key=None,
+                pairing_oobrn=None,
+            )
+            db.session.add(device)
+            db.session.commit()
 
-    assert response.status_code == 201
-    assert response.json is not None
+            return {"id": str(device.device_id)}
 
-    return response.json.get("clientToken")
+    return create_device
 
 
-@pytest.fixture(name="data_app")
-def fixture_data_app(client: FlaskClient, api_key: str):
-    """Create telemetry data app."""
-    response = client.post(
-        "/scim/v2/EndpointApps",
-        json={
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
-            "applicationType": "telemetry",
-            "applicationName": "Telemetry App 1",
-        },
-        headers={
-            "x-api-key": api_key
-        }
-    )
+def _create_endpoint_app(app: Flask, application_type: str, application_name: str) -> dict:
+    """Insert a token-authenticated endpoint app that survives per-test cleanup.
 
-    assert response.status_code == 201
-    assert response.json is not None
+    Mirrors what POST /scim/v2/EndpointApps stores; test_scim.py covers
+    the HTTP path.
+    """
+    with app.app_context():
+        endpoint_app = EndpointApp()
+        endpoint_app.applicationType = application_type
+        endpoint_app.applicationName = application_name
+        endpoint_app.clientToken = uuid.uuid4()  # type: ignore
+        if application_type == "telemetry":
+            endpoint_app.password = make_hash(str(endpoint_app.clientToken))
+        endpoint_app.createdTime = datetime.datetime.now()
+        endpoint_app.modifiedTime = datetime.datetime.now()
+        db.session.add(endpoint_app)
+        db.session.commit()
 
-    return response.json
+        _MODULE_ENDPOINT_APPS.add(endpoint_app.id)
+        return {
+            "id": str(endpoint_app.id),
+            "clientToken": str(endpoint_app.clientToken),
+        }
 
 
-@pytest.fixture(name="sdf_model")
-def fixture_sdf_model(app: Flask):
-    """Create test SDF model."""
+def _delete_endpoint_app(app: Flask, endpoint_app_id: str):
+    """Remove an endpoint app created by _create_endpoint_app."""
+    endpoint_app_uuid = uuid.UUID(endpoint_app_id)
+    _MODULE_ENDPOINT_APPS.discard(endpoint_app_uuid)
     with app.app_context():
-        model = {
-            "namespace": {"tm": "https://example.com/thermometer"},
-            "sdfThing": {
-                "thermometer": {
-                    "sdfProperty": {
-                        "temperature": {
-                            "type": "number",
-                            "minimum": -40,
-                            "maximum": 125,
-                            "unit": "Cel",
-                            "writable": False,
-                            "sdfProtocolMap": {
-                                "ble": {
-                                    "serviceID": "180d",
-                                    "characteristicID": "2a38"
-                                }
-                            }
-                        },
-                        "temperature_control": {
-                            "type": "number",
-                            "minimum": -40,
-                            "maximum": 125,
-                            "unit": "Cel",
-                            "writable": True,
-                            "sdfProtocolMap": {
-                                "ble": {
-                                    "serviceID": "180d",
-                                    "characteristicID": "2a39"
-                                }
-                            }
-                        },
-                        "humidity": {
-                            "type": "number",
-                            "minimum": 0,
-                            "maximum": 100,
-                            "unit": "%",
-                            "writable": False,
-                            "sdfProtocolMap": {
-                                "ble": {
-                                    "serviceID": "180d",
-                                    "characteristicID": "2a38"
-                                }
-                            }
-                        }
-                    },
-                    "sdfEvent": {
-                        "isPresent": {
-                            "description": "BLE advertisements",
-                            "sdfProtocolMap": {
-                                "ble": {
-                                    "type": "advertisements"
-                                }
-                            }
-                        },
-                        "isConnected": {
-                            "description": "BLE connection event",
-                            "sdfProtocolMap": {
-                                "ble": {
-                                    "type": "connection_events"
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
+        db.session.execute(delete(EndpointApp).filter_by(id=endpoint_app_uuid))
+        db.session.commit()
+
+
+@pytest.fixture(name="control_api_key", scope="module")
+def fixture_control_api_key(app_session: Flask):
+    """Create control app once per module and return API key."""
+    endpoint_app = _create_endpoint_app(
+        app_session, "deviceControl", "Device Control App 1")
+
+    yield endpoint_app.get("clientToken")
+
+    _delete_endpoint_app(app_session, endpoint_app["id"])
+
+
+@pytest.fixture(name="data_app", scope="module")
+def fixture_data_app(app_session: Flask):
+    """Create telemetry data app once per module."""
+    endpoint_app = _create_endpoint_app(
+        app_session, "telemetry", "Telemetry App 1")
+
+    yield endpoint_app
+
+    _delete_endpoint_app(app_session, endpoint_app["id"])
+
+
+@pytest.fixture(name="sdf_model", scope="module")
+def fixture_sdf_model(app_session: Flask):
+    """Create test SDF model, shared by the tests of a module."""
+    with app_session.app_context():
         sdf_model = SdfModel(sdf_name="https://example.com/thermometer",
-                             model=model)
+                             model=_THERMOMETER_SDF_MODEL)
         db.session.add(sdf_model)
         db.session.commit()
-        yield sdf_model
+        db.session.refresh(sdf_model)
+        db.session.expunge(sdf_model)
+
+    yield sdf_model
+
+    with app_session.app_context():
+        db.session.execute(delete(SdfModel).filter_by(sdf_name=sdf_model.sdf_name))
+        db.session.commit()
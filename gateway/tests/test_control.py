@@ -11,55 +11,64 @@ Test Gateway controller implementation
 import uuid
 import base64
 import urllib.parse
+from typing import Callable
+from flask import Flask
 from flask.testing import FlaskClient
+from werkzeug.test import TestResponse
 import pytest
 import ap_factory
 from data_producer import DataProducer
+from database import db
 from mock.mock_access_point import MockAccessPoint
-from nipc_models import SdfModel
+from nipc_models import DataApp, SdfModel
 # pylint: disable-next=unused-import
 from scim_fdo import FDOExtension
 # pylint: disable-next=unused-import
 from scim_ethermab import EtherMABExtension
 
-@pytest.fixture(name="ble_ap", autouse=True)
-def fixture_ble_ap(data_producer: DataProducer):
-    """ BLE Access Point """
-    ble_ap = MockAccessPoint(data_producer)
-    ap_factory.set_ble_ap(ble_ap)
-    ble_ap.start()
+_THERMOMETER = "https://example.com/thermometer#/sdfThing/thermometer"
+TEMPERATURE_PROP = f"{_THERMOMETER}/sdfProperty/temperature"
+TEMPERATURE_PROP_Q = urllib.parse.quote(TEMPERATURE_PROP, safe='')
+HUMIDITY_PROP = f"{_THERMOMETER}/sdfProperty/humidity"
+HUMIDITY_PROP_Q = urllib.parse.quote(HUMIDITY_PROP, safe='')
+TEMPERATURE_CONTROL_PROP = f"{_THERMOMETER}/sdfProperty/temperature_control"
+INVALID_PROP = "https://example.com/nonexistent#/sdfThing/invalid/sdfProperty/test"
+INVALID_PROP_Q = urllib.parse.quote(INVALID_PROP, safe='')
+IS_PRESENT_EVENT = f"{_THERMOMETER}/sdfEvent/isPresent"
+IS_PRESENT_EVENT_Q = urllib.parse.quote(IS_PRESENT_EVENT, safe='')
+IS_CONNECTED_EVENT = f"{_THERMOMETER}/sdfEvent/isConnected"
+IS_CONNECTED_EVENT_Q = urllib.parse.quote(IS_CONNECTED_EVENT, safe='')
 
-    yield ble_ap
 
+@pytest.fixture(name="mock_ap", scope="session")
+def fixture_mock_ap():
+    """ Mock BLE Access Point, started once per session """
+    mock_ap = MockAccessPoint(None)  # type: ignore
+    mock_ap.start()
 
-def create_device(client: FlaskClient, api_key: str):
-    """ Test POST Device """
-    response = client.post(
-        "/scim/v2/Devices",
-        json={
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
-                        "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
-            "displayName": "BLE Heart Monitor",
-            "active": True,
-            "urn:ietf:params:scim:schemas:extension:ble:2.0:Device": {
-                "versionSupport": ["5.3"],
-                "deviceMacAddress": "AA:BB:CC:11:22:33",
-                "isRandom": False,
-                "mobility": True
-            }
-        }, headers={
-            "x-api-key": api_key
-        }
-    )
+    yield mock_ap
+
+
+@pytest.fixture(name="ble_ap")
+def fixture_ble_ap(mock_ap: MockAccessPoint, data_producer: DataProducer):
+    """ BLE Access Point, reset and bound to this test's data producer """
+    mock_ap.reset(data_producer)
+    ap_factory.set_ble_ap(mock_ap)
+
+    yield mock_ap
 
-    assert response.json is not None
 
-    return response.json
+def _assert_properties_returned(response: TestResponse, expected: set[str]):
+    """ Check that a property read returned a result for every expected property """
+    assert expected <= {result["property"] for result in response.json}
 
 
-def test_connect_device(client: FlaskClient, api_key: str, control_api_key: str):
+def test_connect_device(client: FlaskClient,
+                        ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                        device_factory: Callable[[], dict],
+                        control_api_key: str):
     """ Test connecting a device """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     response = client.post(
         f"/nipc/devices/{device['id']}/connections",
@@ -75,9 +84,9 @@ def test_connect_device(client: FlaskClient, api_key: str, control_api_key: str)
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert response.json.get("id") == device["id"]
-    assert isinstance(response.json.get("protocolInformation"), dict)
+    body = response.get_json()
+    assert body["id"] == device["id"]
+    assert isinstance(body["protocolInformation"], dict)
 
     response = client.get(
         f"/nipc/devices/{device['id']}/connections",
@@ -87,8 +96,8 @@ def test_connect_device(client: FlaskClient, api_key: str, control_api_key: str)
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
     # disconnect the device after testing
     response = client.delete(
@@ -99,13 +108,16 @@ def test_connect_device(client: FlaskClient, api_key: str, control_api_key: str)
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
 
-def test_update_connection(client: FlaskClient, api_key: str, control_api_key: str):
+def test_update_connection(client: FlaskClient,
+                           ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                           device_factory: Callable[[], dict],
+                           control_api_key: str):
     """ Test updating a device connection service map """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # First connect the device
     response = client.post(
@@ -150,8 +162,8 @@ def test_update_connection(client: FlaskClient, api_key: str, control_api_key: s
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
     # Test DELETE /nipc/devices/{id}/connections - Disconnect
     response = client.delete(
@@ -162,8 +174,8 @@ def test_update_connection(client: FlaskClient, api_key: str, control_api_key: s
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
 
 def test_connection_errors(client: FlaskClient, control_api_key: str):
@@ -185,17 +197,19 @@ def test_connection_errors(client: FlaskClient, control_api_key: str):
     )
 
     assert response.status_code == 404
-    assert response.json is not None
-    assert response.json.get("type") == \
+    body = response.get_json()
+    assert body["type"] == \
         "https://www.iana.org/assignments/nipc-problem-types#invalid-id"
-    assert response.json.get("title") == "Not Found"
-    assert response.json.get("status") == 404
+    assert body["title"] == "Not Found"
+    assert body["status"] == 404
 
 
-def test_property_read_with_explicit_connection(client: FlaskClient, api_key: str,
-                                               control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+def test_property_read_with_explicit_connection(client: FlaskClient,
+                                                ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                                device_factory: Callable[[], dict],
+                                                control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """Test property read with explicit device connection"""
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Explicitly connect the device
     response = client.post(
@@ -204,22 +218,20 @@ def test_property_read_with_explicit_connection(client: FlaskClient, api_key: st
         json={"retries": 3, "protocolInformation": {"ble": {}}}
     )
     assert response.status_code == 200
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
     # Perform a property read while connected
-    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                     "sdfProperty/temperature")
-    encoded_property = urllib.parse.quote(property_name)
     response = client.get(
-        f"/nipc/devices/{device['id']}/properties?propertyName={encoded_property}",
+        f"/nipc/devices/{device['id']}/properties?propertyName={TEMPERATURE_PROP_Q}",
         headers={"x-api-key": control_api_key}
     )
     assert response.status_code == 200
-    assert response.json is not None
-    assert isinstance(response.json, list)
-    assert len(response.json) == 1
-    result = response.json[0]
-    assert result.get("property") == property_name
+    body = response.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 1
+    result = body[0]
+    assert result["property"] == TEMPERATURE_PROP
     assert "value" in result
     assert isinstance(result["value"], str)
 
@@ -229,7 +241,8 @@ def test_property_read_with_explicit_connection(client: FlaskClient, api_key: st
         headers={"x-api-key": control_api_key}
     )
     assert response.status_code == 200
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
     # Disconnect the device after testing
     response = client.delete(
@@ -237,33 +250,32 @@ def test_property_read_with_explicit_connection(client: FlaskClient, api_key: st
         headers={"x-api-key": control_api_key}
     )
     assert response.status_code == 200
-    assert response.json.get("id") == device["id"]
+    body = response.get_json()
+    assert body["id"] == device["id"]
 
 
-def test_property_read_with_auto_connection(client: FlaskClient, api_key: str,
-                                           control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+def test_property_read_with_auto_connection(client: FlaskClient,
+                                            ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                            device_factory: Callable[[], dict],
+                                            control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """ Test property read with automatic connection management """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Test reading a property when device is not connected
-    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                     "sdfProperty/temperature")
-    encoded_property = urllib.parse.quote(property_name, safe='')
-
     response = client.get(
-        f"/nipc/devices/{device['id']}/properties?propertyName={encoded_property}",
+        f"/nipc/devices/{device['id']}/properties?propertyName={TEMPERATURE_PROP_Q}",
         headers={
             "x-api-key": control_api_key
         }
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert isinstance(response.json, list)
-    assert len(response.json) == 1
+    body = response.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 1
 
-    result = response.json[0]
-    assert result.get("property") == property_name
+    result = body[0]
+    assert result["property"] == TEMPERATURE_PROP
     assert "value" in result
     # Value should be base64 encoded
     assert isinstance(result["value"], str)
@@ -272,51 +284,45 @@ def test_property_read_with_auto_connection(client: FlaskClient, api_key: str,
     # (we can't directly test this without mocking, but the endpoint should handle it)
 
 
-def test_property_read_multiple_properties(client: FlaskClient, api_key: str,
-                                          control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+def test_property_read_multiple_properties(client: FlaskClient,
+                                           ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                           device_factory: Callable[[], dict],
+                                           control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """ Test reading multiple properties """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Test reading multiple properties
-    temp_property = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                     "sdfProperty/temperature")
-    humidity_property = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                         "sdfProperty/humidity")
-
     response = client.get(
         f"/nipc/devices/{device['id']}/properties?"
-        f"propertyName={urllib.parse.quote(temp_property, safe='')}&"
-        f"propertyName={urllib.parse.quote(humidity_property, safe='')}",
+        f"propertyName={TEMPERATURE_PROP_Q}&"
+        f"propertyName={HUMIDITY_PROP_Q}",
         headers={
             "x-api-key": control_api_key
         }
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert isinstance(response.json, list)
-    assert len(response.json) == 2
+    body = response.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 2
 
-    # Check that both properties are returned
-    properties = [result.get("property") for result in response.json]
-    assert temp_property in properties
-    assert humidity_property in properties
+    _assert_properties_returned(response, {TEMPERATURE_PROP, HUMIDITY_PROP})
 
 
-def test_property_write_with_auto_connection(client: FlaskClient, api_key: str,
-                                            control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+def test_property_write_with_auto_connection(client: FlaskClient,
+                                             ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                             device_factory: Callable[[], dict],
+                                             control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """ Test property write with automatic connection management """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Test writing a property when device is not connected
-    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                     "sdfProperty/temperature_control")
     test_value = base64.b64encode(b"25.5").decode('ascii')
 
     response = client.put(
         f"/nipc/devices/{device['id']}/properties",
         json=[{
-            "property": property_name,
+            "property": TEMPERATURE_CONTROL_PROP,
             "value": test_value
         }],
         headers={
@@ -325,28 +331,28 @@ def test_property_write_with_auto_connection(client: FlaskClient, api_key: str,
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert isinstance(response.json, list)
-    assert len(response.json) == 1
+    body = response.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 1
 
-    result = response.json[0]
-    assert result.get("status") == 200
+    result = body[0]
+    assert result["status"] == 200
 
 
-def test_property_write_readonly_property(client: FlaskClient, api_key: str,
-                                         control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+def test_property_write_readonly_property(client: FlaskClient,
+                                          ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                          device_factory: Callable[[], dict],
+                                          control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """ Test writing to a read-only property """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Test writing to a read-only property (temperature - read only)
-    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                     "sdfProperty/temperature")
     test_value = base64.b64encode(b"25.5").decode('ascii')
 
     response = client.put(
         f"/nipc/devices/{device['id']}/properties",
         json=[{
-            "property": property_name,
+            "property": TEMPERATURE_PROP,
             "value": test_value
         }],
         headers={
@@ -355,71 +361,68 @@ def test_property_write_readonly_property(client: FlaskClient, api_key: str,
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert isinstance(response.json, list)
-    assert len(response.json) == 1
+    body = response.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 1
 
-    result = response.json[0]
-    assert result.get("type") == ("https://www.iana.org/assignments/"
-                                  "nipc-problem-types#property-not-writable")
-    assert result.get("status") == 400
-    assert "not writable" in result.get("detail", "").lower()
+    result = body[0]
+    assert result["type"] == ("https://www.iana.org/assignments/"
+                              "nipc-problem-types#property-not-writable")
+    assert result["status"] == 400
+    assert "not writable" in result["detail"].lower()
 
 
-def test_property_invalid_sdf_reference(client: FlaskClient, api_key: str,
-                                       control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+def test_property_invalid_sdf_reference(client: FlaskClient,
+                                        ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                        device_factory: Callable[[], dict],
+                                        control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """ Test property operations with invalid SDF reference """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Test with invalid SDF reference
-    invalid_property = ("https://example.com/nonexistent#/sdfThing/invalid/"
-                        "sdfProperty/test")
-
     response = client.get(
         f"/nipc/devices/{device['id']}/properties?"
-        f"propertyName={urllib.parse.quote(invalid_property, safe='')}",
+        f"propertyName={INVALID_PROP_Q}",
         headers={
             "x-api-key": control_api_key
         }
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert isinstance(response.json, list)
-    assert len(response.json) == 1
+    body = response.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 1
 
-    result = response.json[0]
-    assert result.get("type") == ("https://www.iana.org/assignments/"
-                                  "nipc-problem-types#invalid-sdf-url")
-    assert result.get("status") == 400
+    result = body[0]
+    assert result["type"] == ("https://www.iana.org/assignments/"
+                              "nipc-problem-types#invalid-sdf-url")
+    assert result["status"] == 400
 
 
 def test_property_nonexistent_device(client: FlaskClient, control_api_key: str):
     """ Test property operations on non-existent device """
     non_existent_device_id = str(uuid.uuid4())
-    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
-                     "sdfProperty/temperature")
 
     # Test read
     response = client.get(
         f"/nipc/devices/{non_existent_device_id}/properties?"
-        f"propertyName={urllib.parse.quote(property_name, safe='')}",
+        f"propertyName={TEMPERATURE_PROP_Q}",
         headers={
             "x-api-key": control_api_key
         }
     )
 
     assert response.status_code == 404
-    assert response.json is not None
-    assert response.json.get("type") == ("https://www.iana.org/assignments/"
-                                         "nipc-problem-types#invalid-id")
-    assert response.json.get("status") == 404
+    body = response.get_json()
+    assert body["type"] == ("https://www.iana.org/assignments/"
+                            "nipc-problem-types#invalid-id")
+    assert body["status"] == 404
 
     # Test write
     response = client.put(
         f"/nipc/devices/{non_existent_device_id}/properties",
         json=[{
-            "property": property_name,
+            "property": TEMPERATURE_PROP,
             "value": base64.b64encode(b"25.5").decode('ascii')
         }],
         headers={
@@ -428,16 +431,18 @@ def test_property_nonexistent_device(client: FlaskClient, control_api_key: str):
     )
 
     assert response.status_code == 404
-    assert response.json is not None
-    assert response.json.get("type") == ("https://www.iana.org/assignments/"
-                                         "nipc-problem-types#invalid-id")
-    assert response.json.get("status") == 404
+    body = response.get_json()
+    assert body["type"] == ("https://www.iana.org/assignments/"
+                            "nipc-problem-types#invalid-id")
+    assert body["status"] == 404
 
 
-def test_property_missing_parameters(client: FlaskClient, api_key: str,
-                                    control_api_key: str):
+def test_property_missing_parameters(client: FlaskClient,
+                                     ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                     device_factory: Callable[[], dict],
+                                     control_api_key: str):
     """ Test property operations with missing parameters """
-    device = create_device(client, api_key)
+    device = device_factory()
 
     # Test read without propertyName parameter
     response = client.get(
@@ -448,10 +453,10 @@ def test_property_missing_parameters(client: FlaskClient, api_key: str,
     )
 
     assert response.status_code == 400
-    assert response.json is not None
-    assert response.json.get("type") == ("https://www.iana.org/assignments/"
-                                         "nipc-problem-types#invalid-sdf-url")
-    assert response.json.get("status") == 400
+    body = response.get_json()
+    assert body["type"] == ("https://www.iana.org/assignments/"
+                            "nipc-problem-types#invalid-sdf-url")
+    assert body["status"] == 400
 
     # Test write without request body
     response = client.put(
@@ -462,12 +467,20 @@ def test_property_missing_parameters(client: FlaskClient, api_key: str,
     )
 
     assert response.status_code == 400
-    assert response.json is not None
-    assert response.json.get("type") == ("https://www.iana.org/assignments/"
-                                         "nipc-problem-types#invalid-sdf-url")
+    body = response.get_json()
+    assert body["type"] == ("https://www.iana.org/assignments/"
+                            "nipc-problem-types#invalid-sdf-url")
+
+
+def _data_app_events(app: Flask, data_app_id: str) -> list[str]:
+    """ Events stored for a data app registration """
+    with app.app_context():
+        data_app = db.session.query(DataApp).filter_by(data_app_id=data_app_id).one()
+        return data_app.events
 
 
 def test_register_data_app(
+    app: Flask,
     client: FlaskClient,
     control_api_key: str,
     sdf_model: SdfModel, # pylint: disable=unused-argument
@@ -477,8 +490,7 @@ def test_register_data_app(
     initial_request_body = {
         "events": [
             {
-                "event": "https://example.com/thermometer"
-                         "#/sdfThing/thermometer/sdfEvent/isPresent"
+                "event": IS_PRESENT_EVENT
             }
         ],
         "mqttClient": True
@@ -494,25 +506,17 @@ def test_register_data_app(
     )
 
     assert response.status_code == 200
-    assert response.json == initial_request_body
+    body = response.get_json()
+    assert body == initial_request_body
 
-    # Test 2: Get data app (GET)
-    response = client.get(
-        f"/nipc/registrations/data-apps?dataAppId={data_app_id}",
-        headers={
-            "x-api-key": control_api_key
-        }
-    )
-
-    assert response.status_code == 200
-    assert response.json == initial_request_body
+    # Test 2: Registration is stored
+    assert _data_app_events(app, data_app_id) == [IS_PRESENT_EVENT]
 
     # Test 3: Update data app (PUT)
     updated_request_body = {
         "events": [
             {
-                "event": "https://example.com/thermometer"
-                         "#/sdfThing/thermometer/sdfEvent/isConnected"
+                "event": IS_CONNECTED_EVENT
             }
         ],
         "mqttClient": True
@@ -526,10 +530,9 @@ def test_register_data_app(
         }
     )
 
-    print(response.json)
-
     assert response.status_code == 200
-    assert response.json == updated_request_body
+    body = response.get_json()
+    assert body == updated_request_body
 
     # Test 4: Verify update by getting data app again
     response = client.get(
@@ -541,6 +544,7 @@ def test_register_data_app(
 
     assert response.status_code == 200
     assert response.json == updated_request_body
+    assert _data_app_events(app, data_app_id) == [IS_CONNECTED_EVENT]
 
     # Test 5: Delete data app (DELETE)
     response = client.delete(
@@ -551,7 +555,8 @@ def test_register_data_app(
     )
 
     assert response.status_code == 200
-    assert response.json == updated_request_body  # Should return what was deleted
+    body = response.get_json()
+    assert body == updated_request_body  # Should return what was deleted
 
     # Test 6: Verify deletion by trying to get non-existent data app
     response = client.get(
@@ -562,27 +567,25 @@ def test_register_data_app(
     )
 
     assert response.status_code == 404
-    assert response.json is not None
-    assert response.json.get("type") == "about:blank"
-    assert response.json.get("status") == 404
-    assert f"Data app with ID {data_app_id} not found" in response.json.get("detail", "")
+    body = response.get_json()
+    assert body["type"] == "about:blank"
+    assert body["status"] == 404
+    assert f"Data app with ID {data_app_id} not found" in body["detail"]
 
 
 def test_device_events(
     client: FlaskClient,
-    api_key: str,
+    device_factory: Callable[[], dict],
     control_api_key: str,
     sdf_model: SdfModel) -> None:  # pylint: disable=unused-argument
     """ Test complete device event CRUD operations """
     # First create a device to test events on
-    device = create_device(client, api_key)
+    device = device_factory()
     device_id = device['id']
 
     # Test 1: Enable event (POST)
-    event_name = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isPresent"
-    encoded_event_name = urllib.parse.quote(event_name)
     response = client.post(
-        f"/nipc/devices/{device_id}/events?eventName={encoded_event_name}",
+        f"/nipc/devices/{device_id}/events?eventName={IS_PRESENT_EVENT_Q}",
         headers={
             "x-api-key": control_api_key
         }
@@ -592,7 +595,6 @@ def test_device_events(
     assert "Location" in response.headers
     # Extract instance ID from Location header
     location_header = response.headers["Location"]
-    print(location_header)
     instance_id = location_header.split("instanceId=")[1]
 
     # Test 2: Get event (GET)
@@ -604,16 +606,14 @@ def test_device_events(
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert len(response.json) == 1
-    assert response.json[0]["event"] == event_name
-    assert response.json[0]["instanceId"] == instance_id
+    body = response.get_json()
+    assert len(body) == 1
+    assert body[0]["event"] == IS_PRESENT_EVENT
+    assert body[0]["instanceId"] == instance_id
 
     # Test 3: Enable second event (POST)
-    event_name2 = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isConnected"
-    encoded_event_name2 = urllib.parse.quote(event_name2)
     response = client.post(
-        f"/nipc/devices/{device_id}/events?eventName={encoded_event_name2}",
+        f"/nipc/devices/{device_id}/events?eventName={IS_CONNECTED_EVENT_Q}",
         headers={
             "x-api-key": control_api_key
         }
@@ -632,13 +632,13 @@ def test_device_events(
     )
 
     assert response.status_code == 200
-    assert response.json is not None
-    assert len(response.json) == 2
-    events = {event["event"]: event["instanceId"] for event in response.json}
-    assert event_name in events
-    assert event_name2 in events
-    assert events[event_name] == instance_id
-    assert events[event_name2] == instance_id2
+    body = response.get_json()
+    assert len(body) == 2
+    events = {event["event"]: event["instanceId"] for event in body}
+    assert IS_PRESENT_EVENT in events
+    assert IS_CONNECTED_EVENT in events
+    assert events[IS_PRESENT_EVENT] == instance_id
+    assert events[IS_CONNECTED_EVENT] == instance_id2
 
     # Test 5: Disable first event (DELETE)
     response = client.delete(
@@ -659,7 +659,8 @@ def test_device_events(
     )
 
     assert response.status_code == 400
-    assert "Event for device ID" in response.json.get("detail", "")
+    body = response.get_json()
+    assert "Event for device ID" in body["detail"]
 
     # Test 7: Verify second event still exists
     response = client.get(
@@ -670,8 +671,9 @@ def test_device_events(
     )
 
     assert response.status_code == 200
-    assert len(response.json) == 1
-    assert response.json[0]["event"] == event_name2
+    body = response.get_json()
+    assert len(body) == 1
+    assert body[0]["event"] == IS_CONNECTED_EVENT
 
     # Test 8: Disable second event (DELETE)
     response = client.delete(
@@ -686,19 +688,16 @@ def test_device_events(
 
 def test_duplicate_event_enable(
     client: FlaskClient,
-    api_key: str,
+    device_factory: Callable[[], dict],
     control_api_key: str,
     sdf_model: SdfModel) -> None:  # pylint: disable=unused-argument
     """ Test enabling duplicate events """
-    device = create_device(client, api_key)
+    device = device_factory()
     device_id = device['id']
 
-    event_name = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isPresent"
-    encoded_event_name = urllib.parse.quote(event_name)
-
     # Enable event first time
     response = client.post(
-        f"/nipc/devices/{device_id}/events?eventName={encoded_event_name}",
+        f"/nipc/devices/{device_id}/events?eventName={IS_PRESENT_EVENT_Q}",
         headers={
             "x-api-key": control_api_key
         }
@@ -708,11 +707,12 @@ def test_duplicate_event_enable(
 
     # Try to enable same event again
     response = client.post(
-        f"/nipc/devices/{device_id}/events?eventName={encoded_event_name}",
+        f"/nipc/devices/{device_id}/events?eventName={IS_PRESENT_EVENT_Q}",
         headers={
             "x-api-key": control_api_key
         }
     )
 
     assert response.status_code == 400
-    assert "Event already exists" in response.json.get("detail", "")
+    body = response.get_json()
+    assert "Event already exists" in body["detail"]
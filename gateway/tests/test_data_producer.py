@@ -7,8 +7,10 @@
 Test gateway data producer.
 """
 
-import time
+import queue
 import urllib.parse
+import uuid
+from typing import Callable
 import cbor2
 import paho.mqtt.client as mqtt
 import pytest
@@ -22,10 +24,11 @@ from nipc_models import BleExtension, SdfModel
 from tests.mosquitto_container import MosquittoContainer
 
 
-@pytest.fixture(name="mqtt_client2")
-def fixture_mqtt_client2(mosquitto: MosquittoContainer):
-    """ MQTT client """
-    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+@pytest.fixture(name="mqtt_session_client2", scope="session")
+def fixture_mqtt_session_client2(mosquitto: MosquittoContainer):
+    """ MQTT client, connected once per session """
+    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2,
+                         client_id=f"test-{uuid.uuid4()}")
     client.username_pw_set("control-app", "test")
     client.connect(mosquitto.get_container_host_ip(),
                    int(mosquitto.get_exposed_port(1883)), 60)
@@ -35,31 +38,32 @@ def fixture_mqtt_client2(mosquitto: MosquittoContainer):
     client.loop_stop()
 
 
-@pytest.fixture(name="device")
-def fixture_device(client: FlaskClient, api_key: str):
-    """ Create BLE device """
-    response = client.post(
-        "/scim/v2/Devices",
-        json={
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
-                        "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
-            "displayName": "BLE Heart Monitor",
-            "active": True,
-            "urn:ietf:params:scim:schemas:extension:ble:2.0:Device": {
-                "versionSupport": ["5.3"],
-                "deviceMacAddress": "AA:BB:CC:11:22:33",
-                "isRandom": False,
-                "mobility": True
-            }
-        }, headers={
-            "x-api-key": api_key
-        }
-    )
+@pytest.fixture(name="mqtt_client2")
+def fixture_mqtt_client2(mqtt_session_client2: mqtt.Client):
+    """ MQTT client; its callbacks are reset after every test """
+    yield mqtt_session_client2
+    mqtt_session_client2.on_subscribe = None
+    mqtt_session_client2.on_message = None
 
-    assert response.status_code == 201
-    assert response.json is not None
 
-    return response.json
+@pytest.fixture(name="mqtt_subscribe")
+def fixture_mqtt_subscribe(mqtt_client2: mqtt.Client):
+    """ Subscribes mqtt_client2 to a topic and unsubscribes after the test """
+    topics: list[str] = []
+
+    def subscribe(topic: str, qos: int = 0) -> tuple[int, int | None]:
+        topics.append(topic)
+        return mqtt_client2.subscribe(topic, qos=qos)
+
+    yield subscribe
+    for topic in topics:
+        mqtt_client2.unsubscribe(topic)
+
+
+@pytest.fixture(name="device")
+def fixture_device(device_factory: Callable[[], dict]):
+    """ Create BLE device """
+    return device_factory()
 
 
 @pytest.fixture(name="registered_data_app")
@@ -97,6 +101,7 @@ def fixture_registered_data_app(client: FlaskClient, data_app: dict, sdf_model:
 
 
 def test_publish_notification(mqtt_client2: mqtt.Client,
+                              mqtt_subscribe: Callable[[str], tuple[int, int | None]],
                               data_producer: DataProducer,
                               client: FlaskClient,
                               control_api_key: str,
@@ -142,20 +147,15 @@ def test_publish_notification(mqtt_client2: mqtt.Client,
     namespace, json_pointer = event_name.split('#', 1)
     expected_topic = f"data-app/{data_app_id}/{namespace}/{json_pointer}"
 
-    def on_message(_client, _userdata, message: mqtt.MQTTMessage):
-        print(
-            f"Received message '{message.payload}' on topic '{message.topic}'")
-        # Verify we received the message on the expected topic
-        assert message.topic == expected_topic
-        data_subscription = cbor2.loads(message.payload)
-        assert data_subscription["deviceID"] == device_id
-        assert data_subscription["bleSubscription"]["serviceID"] == "180d"
-        assert data_subscription["bleSubscription"]["characteristicID"] == "2a37"
-        assert data_subscription["data"] == b"\x00\x00"
-
-    mqtt_client2.on_message = on_message
-    mqtt_client2.subscribe(expected_topic)
-    print(f"Subscribed to topic: {expected_topic}")
+    # Collect messages on the paho thread and check them here, so a failed
+    # assertion fails the test instead of being raised in the network loop
+    acked_mids: queue.Queue[int] = queue.Queue()
+    messages: queue.Queue[mqtt.MQTTMessage] = queue.Queue()
+    mqtt_client2.on_subscribe = lambda _client, _userdata, mid, *_args: acked_mids.put(mid)
+    mqtt_client2.on_message = lambda _client, _userdata, message: messages.put(message)
+    result, mid = mqtt_subscribe(expected_topic)
+    assert result == mqtt.MQTT_ERR_SUCCESS
+    assert acked_mids.get(timeout=5.0) == mid
 
     # Step 4: Publish notification and test end-to-end flow
     data_producer.publish_notification("AA:BB:CC:11:22:33",
@@ -163,5 +163,10 @@ def test_publish_notification(mqtt_client2: mqtt.Client,
                                        "2a37",
                                        b"\x00\x00")
 
-    # wait for on_message callback to be fired
-    time.sleep(1)
+    message = messages.get(timeout=5.0)
+    assert message.topic == expected_topic
+    data_subscription = cbor2.loads(message.payload)
+    assert data_subscription["deviceID"] == device_id
+    assert data_subscription["bleSubscription"]["serviceID"] == "180d"
+    assert data_subscription["bleSubscription"]["characteristicID"] == "2a37"
+    assert data_subscription["data"] == b"\x00\x00"
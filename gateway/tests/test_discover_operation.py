@@ -0,0 +1,43 @@
+# Copyright (c) 2023, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test the silabs discover operation.
+"""
+
+from unittest import mock
+import pytest
+
+from access_point_responses import BleDiscoveryError
+from silabs.ble_operations.discover import DiscoverOperation
+
+
+@pytest.mark.parametrize("services", [
+    ["180d"],
+    ["0000180D-0000-1000-8000-00805F9B34FB"],
+    [{"serviceID": "180d"}],
+])
+def test_discover_requested_services(services: list):
+    """ Test that requested services are discovered by their UUID """
+    lib = mock.Mock()
+    operation = DiscoverOperation(lib, 1, services)
+    operation.wait = mock.Mock()
+    operation.result = 0
+
+    operation.run()
+
+    lib.bt.gatt.discover_primary_services_by_uuid.assert_called_once()
+
+
+@pytest.mark.parametrize("service_id", ["", "180", "18xd", "180d 2a"])
+def test_discover_invalid_service_id(service_id: str):
+    """ Test that an invalid service UUID fails before anything is sent """
+    lib = mock.Mock()
+    operation = DiscoverOperation(lib, 1, [service_id])
+
+    with pytest.raises(BleDiscoveryError):
+        operation.run()
+
+    lib.bt.gatt.discover_primary_services_by_uuid.assert_not_called()
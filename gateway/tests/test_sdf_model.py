@@ -5,90 +5,118 @@
 """
 Unit tests for SDF model registration and management (NIPC draft-12)
 """
+import copy
+from flask import Flask
 from flask.testing import FlaskClient
+import pytest
+from sqlalchemy import delete
+from database import db
+from nipc_models import SdfModel
 # pylint: disable-next=unused-import
 from scim_fdo import FDOExtension
 # pylint: disable-next=unused-import
 from scim_ethermab import EtherMABExtension
 
 
-def sample_sdf_model():
-    """Return a sample SDF model dict."""
-    return {
-        "namespace": {"thermometer": "https://example.com/thermometer"},
-        "defaultNamespace": "thermometer",
-        "sdfObject": {
-            "healthsensor": {
-                "sdfProperty": {
-                    "temperature": {
-                        "sdfProtocolMap": {
-                            "ble": {
-                                "serviceID": "1809",
-                                "characteristicID": "2A1C"
-                            }
+# Sample SDF model; deep-copy it before changing it in a test
+_SDF_MODEL_TEMPLATE = {
+    "namespace": {"thermometer": "https://example.com/thermometer"},
+    "defaultNamespace": "thermometer",
+    "sdfObject": {
+        "healthsensor": {
+            "sdfProperty": {
+                "temperature": {
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "serviceID": "1809",
+                            "characteristicID": "2A1C"
                         }
                     }
-                },
-                "sdfEvent": {
-                    "isPresent": {
-                        "description": "BLE advertisements",
-                        "sdfProtocolMap": {
-                            "ble": {
-                                "type": "advertisements"
-                            }
+                }
+            },
+            "sdfEvent": {
+                "isPresent": {
+                    "description": "BLE advertisements",
+                    "sdfProtocolMap": {
+                        "ble": {
+                            "type": "advertisements"
                         }
                     }
                 }
             }
         }
     }
+}
 
 
-def test_register_and_manage_sdf_model(client: FlaskClient, control_api_key: str) -> None:
-    """Test SDF model registration, duplicate, list, get, update, and delete operations."""
+_INVALID_SDF_URL = "https://www.iana.org/assignments/nipc-problem-types#invalid-sdf-url"
 
-    sdf_headers = {
+
+@pytest.fixture(name="sdf_headers")
+def fixture_sdf_headers(control_api_key: str) -> dict:
+    """Headers for the SDF model registration API."""
+    return {
         "x-api-key": control_api_key,
         "Content-Type": "application/json"
     }
-    # Register
+
+
+@pytest.fixture(name="sdf_name")
+def fixture_sdf_name(app: Flask, client: FlaskClient, sdf_headers: dict):
+    """Register the sample SDF model and return its name.
+
+    The sdf_model table outlives the per-test cleanup, so the model is
+    removed here.
+    """
+    resp = client.post("/nipc/registrations/models",
+                       json=_SDF_MODEL_TEMPLATE, headers=sdf_headers)
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert isinstance(body, list)
+    assert len(body) == 1
+    sdf_name = body[0]["sdfName"]
+
+    yield sdf_name
+
+    with app.app_context():
+        db.session.execute(delete(SdfModel).filter_by(sdf_name=sdf_name))
+        db.session.commit()
+
+
+def test_register_duplicate_sdf_model(client: FlaskClient, sdf_headers: dict,
+                                      sdf_name: str) -> None:  # pylint: disable=unused-argument
+    """Registering the same model twice fails."""
     resp = client.post("/nipc/registrations/models",
-                       json=sample_sdf_model(), headers=sdf_headers)
+                       json=_SDF_MODEL_TEMPLATE, headers=sdf_headers)
+    assert resp.status_code == 409
+    body = resp.get_json()
+    assert body["type"] == ("https://www.iana.org/assignments/"
+                            "nipc-problem-types#sdf-model-already-registered")
+    assert body["status"] == 409
+
+
+def test_list_sdf_models(client: FlaskClient, sdf_headers: dict, sdf_name: str) -> None:
+    """Registered models are listed."""
+    resp = client.get("/nipc/registrations/models", headers=sdf_headers)
     assert resp.status_code == 200
-    assert resp.json is not None
-    assert len(resp.json) == 1
-    assert isinstance(resp.json, list)
-    assert "sdfName" in resp.json[0]
-    sdf_name = resp.json[0]["sdfName"]
-
-    # Duplicate registration should fail
-    resp2 = client.post("/nipc/registrations/models",
-                        json=sample_sdf_model(), headers=sdf_headers)
-    assert resp2.status_code == 409
-    assert resp2.json is not None
-    print("Duplicate registration error response:", resp2.json)
-    assert resp2.json["type"] == ("https://www.iana.org/assignments/"
-                                 "nipc-problem-types#sdf-model-already-registered")
-    assert resp2.json["status"] == 409
-
-    # List models
-    resp3 = client.get("/nipc/registrations/models", headers=sdf_headers)
-    assert resp3.status_code == 200
-    assert resp3.json is not None
-    assert isinstance(resp3.json, list)
-    assert any(model["sdfName"] == sdf_name for model in resp3.json)
-
-    # Get model by name (URL-encoded as query parameter)
-    resp4 = client.get(
+    body = resp.get_json()
+    assert isinstance(body, list)
+    assert any(model["sdfName"] == sdf_name for model in body)
+
+
+def test_get_sdf_model(client: FlaskClient, sdf_headers: dict, sdf_name: str) -> None:
+    """A model is returned by name (URL-encoded as query parameter)."""
+    resp = client.get(
         "/nipc/registrations/models",
         query_string={"sdfName": sdf_name},
         headers=sdf_headers)
-    assert resp4.status_code == 200
-    assert resp4.json is not None
-    assert resp4.json["sdfObject"] == sample_sdf_model()["sdfObject"]
+    assert resp.status_code == 200
+    assert resp.get_json()["sdfObject"] == _SDF_MODEL_TEMPLATE["sdfObject"]
 
-    # Update model (valid update: add a property, not change namespace)
-    updated = sample_sdf_model()
+
+def test_update_sdf_model(client: FlaskClient, sdf_headers: dict, sdf_name: str) -> None:
+    """A model can be updated as long as its namespaces stay the same."""
+    updated = copy.deepcopy(_SDF_MODEL_TEMPLATE)
     updated["sdfObject"]["healthsensor"]["sdfProperty"]["humidity"] = {
         "sdfProtocolMap": {
             "ble": {
@@ -97,66 +125,55 @@ def test_register_and_manage_sdf_model(client: FlaskClient, control_api_key: str
             }
         }
     }
-    resp5 = client.put(
+    resp = client.put(
         "/nipc/registrations/models",
         query_string={"sdfName": sdf_name},
         json=updated,
         headers=sdf_headers
     )
-    assert resp5.status_code == 200
-    # Confirm update
-    resp6 = client.get(
+    assert resp.status_code == 200
+
+    resp = client.get(
         "/nipc/registrations/models",
         query_string={"sdfName": sdf_name},
         headers=sdf_headers)
-    assert resp6.status_code == 200
-    assert resp6.json is not None
-    print(resp6.json)
-    assert "humidity" in resp6.json["sdfObject"]["healthsensor"]["sdfProperty"]
-
-    # Attempt to update namespace (should fail)
-    forbidden_update = sample_sdf_model()
-    forbidden_update["namespace"] = {
-        "thermometer": "https://malicious.com/other"}
-    resp_forbidden = client.put(
+    assert resp.status_code == 200
+    assert "humidity" in resp.get_json()["sdfObject"]["healthsensor"]["sdfProperty"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("namespace", {"thermometer": "https://malicious.com/other"}),
+    ("defaultNamespace", "other"),
+])
+def test_update_sdf_model_namespace_forbidden(client: FlaskClient, sdf_headers: dict,
+                                              sdf_name: str, field: str, value) -> None:
+    """Changing a model's namespace or default namespace is rejected."""
+    forbidden_update = copy.deepcopy(_SDF_MODEL_TEMPLATE)
+    forbidden_update[field] = value
+    resp = client.put(
         "/nipc/registrations/models",
         query_string={"sdfName": sdf_name},
         json=forbidden_update,
         headers=sdf_headers)
-    assert resp_forbidden.status_code == 400
-    assert resp_forbidden.json is not None
-    print("Namespace update error response:", resp_forbidden.json)
-    assert resp_forbidden.json["type"] == ("https://www.iana.org/assignments/"
-                                         "nipc-problem-types#invalid-sdf-url")
-    assert resp_forbidden.json["status"] == 400
-
-    # Attempt to update defaultNamespace (should fail)
-    forbidden_update2 = sample_sdf_model()
-    forbidden_update2["defaultNamespace"] = "other"
-    resp_forbidden2 = client.put(
-        "/nipc/registrations/models",
-        query_string={"sdfName": sdf_name},
-        json=forbidden_update2,
-        headers=sdf_headers)
-    assert resp_forbidden2.status_code == 400
-    assert resp_forbidden2.json is not None
-    assert resp_forbidden2.json["type"] == \
-        "https://www.iana.org/assignments/nipc-problem-types#invalid-sdf-url"
-    assert resp_forbidden2.json["status"] == 400
-
-    # Delete model
-    resp7 = client.delete(
+    assert resp.status_code == 400
+    body = resp.get_json()
+    assert body["type"] == _INVALID_SDF_URL
+    assert body["status"] == 400
+
+
+def test_delete_sdf_model(client: FlaskClient, sdf_headers: dict, sdf_name: str) -> None:
+    """A deleted model can no longer be fetched."""
+    resp = client.delete(
         "/nipc/registrations/models",
         query_string={"sdfName": sdf_name},
         headers=sdf_headers)
-    assert resp7.status_code == 200
-    # Confirm deletion
-    resp8 = client.get(
+    assert resp.status_code == 200
+
+    resp = client.get(
         "/nipc/registrations/models",
         query_string={"sdfName": sdf_name},
         headers=sdf_headers)
-    assert resp8.status_code == 404
-    assert resp8.json is not None
-    assert resp8.json["type"] == \
-        "https://www.iana.org/assignments/nipc-problem-types#invalid-sdf-url"
-    assert resp8.json["status"] == 404
+    assert resp.status_code == 404
+    body = resp.get_json()
+    assert body["type"] == _INVALID_SDF_URL
+    assert body["status"] == 404
@@ -11,15 +11,25 @@ real-time updates.
 
 """
 
-import base64
-import json
+# eventlet has to patch socket/ssl/threading before anything imports them,
+# otherwise outbound requests calls block every Socket.IO handler
+import eventlet
+eventlet.monkey_patch()
+
+# pylint: disable=wrong-import-position,wrong-import-order
 import sys
 import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional
 
 import logging
 from urllib.parse import quote, unquote
 
+import orjson
 from flask import Flask, render_template, request, redirect
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, namespace
 from requests_oauth2client import OAuth2AuthorizationCodeAuth
 from tiedie.models import (Device, BleDataParameter,
@@ -34,8 +44,20 @@ import configuration
 
 sys.path.append(os.path.dirname(os.path.dirname(os.getcwd())))
 
+
+class OrjsonProvider(JSONProvider):
+    """ Flask JSON provider backed by orjson, used for request.json and
+    jsonify """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
-socketio = SocketIO(app, websocket=True, cors_allowed_origins="*")
+app.json = OrjsonProvider(app)
 
 app.jinja_env.filters['quote'] = lambda s: quote(s, safe='')
 
@@ -50,42 +72,108 @@ handler.setFormatter(logging.Formatter(
     '[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s'))
 tiedie_logger.addHandler(handler)
 
+app_logger = logging.getLogger('sample_app')
+app_logger.addHandler(handler)
+
 if os.environ.get("DOCKER_BUILD"):
     app.config.from_pyfile("/config/config.ini")
 else:
     app.config.from_pyfile("../config/config.ini")
 
+app_logger.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+
+socketio = SocketIO(app, websocket=True, cors_allowed_origins="*")
+
 client_config = configuration.ClientConfig(app)
+OAUTH_ENABLED = client_config.oauth_client_id is not None
 
 app.az_request = None
+# set by init_clients() once all clients below are created
+app.clients_ready = False
+clients_lock = threading.Lock()
 app.onboarding_client = None
 app.control_client = None
 app.data_receiver_client = None
 app.endpoint_apps = []
+# Application references to app.endpoint_apps, attached to every device
+app.endpoint_app_applications = []
 app.data_endpoint_app = None
+app.data_app_topic_quoted = None
+# Socket.IO clients on /subscription and the topics subscribed for them
+app.subscriber_count = 0
+app.subscribed_topics = set()
+# device_id -> (expiry, Device) in expiry order, see get_device_cached()
+app.device_cache = OrderedDict()
+
+DEVICE_CACHE_TTL = 10.0
+DEVICE_CACHE_MAXSIZE = 1024
+EMIT_BATCH_INTERVAL = 0.02
+SDF_FETCH_CONCURRENCY = 8
 
 def init_clients():
     """Initializes the clients for onboarding, control, and data receiver."""
-    if app.onboarding_client is None:
-        print("Initializing clients...")
+    if app.clients_ready:
+        return
+    # requests arriving while the first one is still initializing must wait
+    # for it instead of registering the endpoint apps a second time
+    with clients_lock:
+        if app.clients_ready:
+            return
+        app_logger.info("Initializing clients...")
         app.onboarding_client = client_config.get_onboarding_client()
         app.endpoint_apps = client_config.get_endpoint_apps(app.onboarding_client)
+        app.endpoint_app_applications = [
+            Application(value=endpoint_app.application_id)
+            for endpoint_app in app.endpoint_apps
+            if endpoint_app is not None and endpoint_app.application_id is not None
+        ]
         app.data_endpoint_app = app.endpoint_apps[1]
+        app.data_app_topic_quoted = quote(
+            f'data-app/{app.data_endpoint_app.application_id}/#'
+        )
         app.control_client = client_config.get_control_client(
             control_app_endpoint=app.endpoint_apps[0]
         )
         app.data_receiver_client = client_config.get_data_receiver_client(
             data_app_endpoint=app.data_endpoint_app
         )
+        app.clients_ready = True
+
+def get_device_cached(device_id: str) -> Optional[Device]:
+    """Gets a device from the onboarding app, reusing a copy fetched within
+    the last DEVICE_CACHE_TTL seconds."""
+    cached = app.device_cache.get(device_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    response = app.onboarding_client.get_device(device_id)
+    if response.status_code != 200 or response.body is None:
+        return None
+
+    # every entry lives for the same TTL, so the oldest ones expire first
+    now = time.monotonic()
+    app.device_cache.pop(device_id, None)
+    while app.device_cache and (next(iter(app.device_cache.values()))[0] <= now
+                                or len(app.device_cache) >= DEVICE_CACHE_MAXSIZE):
+        app.device_cache.popitem(last=False)
+    app.device_cache[device_id] = (now + DEVICE_CACHE_TTL, response.body)
+    return response.body
+
+
+def device_ref(device_id: str) -> Device:
+    """Builds a Device carrying only its id, for control API calls that are
+    keyed by the device id and don't need the onboarding record."""
+    return Device.model_construct(device_id=device_id)
+
 
 @app.before_request
 def redirect_to_oauth():
     """Redirects to OAuth2 authorization endpoint if client ID is provided."""
-    if client_config.oauth_client_id is not None and \
-        app.az_request is None and not request.path.startswith("/oauth"):
+    if request.path.startswith("/oauth"):
+        return None
+    if OAUTH_ENABLED and app.az_request is None:
         return redirect("/oauth2/authorize")
-    if not request.path.startswith("/oauth"):
-        init_clients()
+    init_clients()
     return None
 
 
@@ -112,9 +200,12 @@ def oauth_callback():
     az_response = app.az_request.validate_callback(request.url)
     if az_response.code is None:
         app.az_request = None
+    # the auth object keeps the bearer token and renews it with the refresh
+    # token once it is within a minute of expiry
     client_config.oauth_authenticator.session_auth = OAuth2AuthorizationCodeAuth(
         client_config.oauth2client,
         code=az_response,
+        leeway=60,
     )
     init_clients()
     return redirect("/devices")
@@ -127,16 +218,11 @@ def update_data_app(event: str, enable: bool):
     )
     if response.http and response.http.status_code != 200 or response.body is None:
         if client_config.data_app_mqtt_type == "broker":
-            ca_cert = None
-            ca_cert_path = client_config.data_app_ca_cert_path
-            if ca_cert_path is not None:
-                with open(ca_cert_path, 'r', encoding='utf-8') as ca_cert_file:
-                    ca_cert = ca_cert_file.read()
             mqtt_broker = MqttBrokerConfig(
                 uri=f"{client_config.data_app_host}:{client_config.data_app_port}",
                 username=client_config.data_app_username,
                 password=client_config.data_app_password,
-                broker_ca_cert=ca_cert,
+                broker_ca_cert=client_config.get_data_app_ca_cert(),
             )
             response = app.control_client.create_data_app(
                 app.data_endpoint_app.application_id,
@@ -159,13 +245,10 @@ def update_data_app(event: str, enable: bool):
         data_app = response.body
         events = data_app.events
         if enable:
-            if event not in [e.event for e in events]:
+            if event not in {e.event for e in events}:
                 events.append(Event(event=event))
         else:
-            for e in events:
-                if e.event == event:
-                    events.remove(e)
-                    break
+            events = [e for e in events if e.event != event]
         if len(events) == 0:
             response = app.control_client.delete_data_app(
                 app.data_endpoint_app.application_id
@@ -189,37 +272,75 @@ class SubscriptionHandler(namespace.Namespace):
 
     def on_connect(self, *_):
         """ function to define what happens on connection """
-        app.data_receiver_client.connect()
+        # all browser clients share the one MQTT connection
+        if app.subscriber_count == 0:
+            app.data_receiver_client.connect()
+        app.subscriber_count += 1
 
     def on_disconnect(self):
         """ function to define what happens on disconnection """
-        app.data_receiver_client.disconnect()
+        for topic in list(self.rooms(request.sid)):
+            if topic in app.subscribed_topics:
+                self._leave_topic(topic)
+        app.subscriber_count -= 1
+        if app.subscriber_count == 0:
+            app.data_receiver_client.disconnect()
+            app.subscribed_topics.clear()
 
     def on_subscribe(self, event):
         """ function to define what happens on subscription """
+        topic = event
+        # every client watching a topic is in the room named after it, so
+        # each batch is encoded once and sent to all of them
+        self.enter_room(request.sid, topic)
+        if topic in app.subscribed_topics:
+            return
+
+        # MQTT messages arriving within EMIT_BATCH_INTERVAL are sent to the
+        # browser as one list; raw payload bytes travel as Socket.IO binary
+        # attachments instead of base64 text
+        pending: deque[dict] = deque()
+        flush_scheduled = threading.Event()
+
+        def flush():
+            socketio.sleep(EMIT_BATCH_INTERVAL)
+            flush_scheduled.clear()
+            batch = []
+            while pending:
+                batch.append(pending.popleft())
+            if batch:
+                self.emit("data", {'data': batch}, room=topic)
+
         def callback(data_subscription: list[dict]):
             try:
-                for data in data_subscription:
-                    if data["data"] is not None:
-                        data["data"] = base64.b64encode(
-                            data["data"]).decode("utf-8")
-                payload = json.dumps(data_subscription)
-                self.emit("data", {'data': payload})
+                pending.extend(data_subscription)
+                if not flush_scheduled.is_set():
+                    flush_scheduled.set()
+                    socketio.start_background_task(flush)
             except Exception as e:
-                print(e)
+                app_logger.error("Failed to forward subscription data: %s", e)
 
-        print(event)
-        topic = event
+        app_logger.debug("Subscribing to %s", topic)
+        app.subscribed_topics.add(topic)
         app.data_receiver_client.subscribe(topic, callback)
 
     def on_unsubscribe(self, event):
         """ function to define what happens on unsubscription """
-        topic = quote(event, safe='')
-        app.data_receiver_client.unsubscribe(topic)
+        self._leave_topic(event)
+
+    def _leave_topic(self, topic):
+        """ Removes the current client from a topic's room, and drops the
+        MQTT subscription once no client is left in it """
+        self.leave_room(request.sid, topic)
+        participants = socketio.server.manager.get_participants(self.namespace, topic)
+        if topic in app.subscribed_topics and next(participants, None) is None:
+            app_logger.debug("Unsubscribing from %s", topic)
+            app.subscribed_topics.discard(topic)
+            app.data_receiver_client.unsubscribe(topic)
 
     def on_error(self, error):
         """ function to define what happens on error """
-        print(error)
+        app_logger.error("Socket.IO error: %s", error)
 
 
 socketio.on_namespace(SubscriptionHandler('/subscription'))
@@ -246,11 +367,8 @@ def get_all_devices():
 @app.route("/data_app")
 def get_subscriptions():
     """ Displays subscription topics and BLE advertisement topics. """
-    topic = quote(
-        f'data-app/{app.data_endpoint_app.application_id}/#'
-    )
     # redirect to get_subscription with the topic
-    return redirect(f"/subscription?event={topic}")
+    return redirect(f"/subscription?event={app.data_app_topic_quoted}")
 
 @app.route("/subscription",  methods=["GET"])
 def get_subscription():
@@ -267,7 +385,7 @@ def add_device():
         return render_template('device_add.html')
 
     content = request.form.to_dict()
-    print(content)
+    app_logger.debug("Add device form: %s", content)
     active = content.get('active', 'off') == 'on'
     is_random = content.get('isRandom', 'off') == 'on'
     version_support = content['versionSupport'].split(',')
@@ -286,11 +404,8 @@ def add_device():
             null_pairing=NullPairing() if pairing_method == 'null' else None,
             pairing_just_works=PairingJustWorks() if pairing_method == 'justWorks' else None,
         ),
-        endpoint_apps_extension=EndpointAppsExtension(applications=[
-            Application(value=endpoint_app.application_id)
-            for endpoint_app in app.endpoint_apps
-            if endpoint_app is not None and endpoint_app.application_id is not None
-        ])
+        endpoint_apps_extension=EndpointAppsExtension(
+            applications=app.endpoint_app_applications)
     )
 
     response = app.onboarding_client.create_device(device)
@@ -307,21 +422,19 @@ def add_device():
 @app.route("/devices/<device_id>/update", methods=["GET", "POST"])
 def update_device(device_id):
     """ Update device in the app """
-    response = app.onboarding_client.get_device(device_id)
+    device = get_device_cached(device_id)
 
-    if response.status_code != 200 or response.body is None:
+    if device is None:
         return render_template(
             "error.html",
             error="Failed to get device"
         )
 
-    device = response.body
-
     if request.method == "GET":
         return render_template("device_update.html", device=device)
 
     content = request.form.to_dict()
-    print(request.form)
+    app_logger.debug("Update device form: %s", request.form)
 
     active = content.get('active', 'off') == 'on'
     is_random = content.get('isRandom', 'off') == 'on'
@@ -342,12 +455,11 @@ def update_device(device_id):
             null_pairing=NullPairing() if pairing_method == 'null' else None,
             pairing_just_works=PairingJustWorks() if pairing_method == 'justWorks' else None,
         ),
-        endpoint_apps_extension=EndpointAppsExtension(applications=[
-            Application(value=endpoint_app.application_id)
-            for endpoint_app in app.endpoint_apps
-        ])
+        endpoint_apps_extension=EndpointAppsExtension(
+            applications=app.endpoint_app_applications)
     )
 
+    app.device_cache.pop(device_id, None)
     response = app.onboarding_client.update_device(device)
 
     if response.status_code != 201 or response.body is None or response.body.device_id is None:
@@ -362,26 +474,27 @@ def update_device(device_id):
 @app.route("/devices/<device_id>")
 def get_device(device_id):
     """ function to get get device """
-    response = app.onboarding_client.get_device(device_id)
+    device = get_device_cached(device_id)
 
-    if response.status_code != 200 or response.body is None:
+    if device is None:
         return render_template(
             "error.html",
             error="Failed to get device"
         )
 
-    device = response.body
-
     sdf_models = {}
 
     response = app.control_client.get_sdf_models()
 
     if response.status_code == 200 and response.body is not None and len(response.body.root) > 0:
-        print(response.body)
-        for sdf_name_resp in response.body.root:
-            response = app.control_client.get_sdf_model(sdf_name_resp.sdf_name)
+        app_logger.debug("SDF models: %s", response.body)
+        sdf_names = [sdf_name_resp.sdf_name for sdf_name_resp in response.body.root]
+        # fetch the models concurrently, one request per green thread
+        pool = eventlet.GreenPool(SDF_FETCH_CONCURRENCY)
+        for sdf_name, response in zip(
+                sdf_names, pool.imap(app.control_client.get_sdf_model, sdf_names)):
             if response.status_code == 200 and response.body is not None:
-                sdf_models[sdf_name_resp.sdf_name] = response.body
+                sdf_models[sdf_name] = response.body
 
     tiedie_response = app.control_client.get_connection(device)
 
@@ -415,15 +528,7 @@ def connect_device(device_id):
     if service_uuids:
         services = [uuid.strip() for uuid in service_uuids.split(",")]
 
-    response = app.onboarding_client.get_device(device_id)
-
-    if response.status_code != 200 or response.body is None:
-        return render_template(
-            "error.html",
-            error="Failed to get device"
-        )
-
-    device = response.body
+    device = device_ref(device_id)
 
     tiedie_response = app.control_client.connect(
         device,
@@ -445,15 +550,7 @@ def connect_device(device_id):
 @app.route("/devices/<device_id>/disconnect", methods=["POST"])
 def disconnect_device(device_id):
     """ function to disconnect a connected device """
-    response = app.onboarding_client.get_device(device_id)
-
-    if response.status_code != 200 or response.body is None:
-        return render_template(
-            "error.html",
-            error="Failed to get device"
-        )
-
-    device = response.body
+    device = device_ref(device_id)
 
     tiedie_response = app.control_client.disconnect(device)
 
@@ -466,6 +563,7 @@ def disconnect_device(device_id):
 @app.route("/devices/<device_id>/delete", methods=["POST"])
 def delete_device(device_id):
     """ function to delete device filter """
+    app.device_cache.pop(device_id, None)
     response = app.onboarding_client.delete_device(device_id)
 
     if response.status_code != 204:
@@ -478,15 +576,7 @@ def delete_device(device_id):
            methods=["POST"])
 def read_characteristic(device_id, service_id, char_id):
     """ Reads a GATT characteristic of an IoT device. """
-    response = app.onboarding_client.get_device(device_id)
-
-    if response.status_code != 200 or response.body is None:
-        return render_template(
-            "error.html",
-            error="Failed to get device"
-        )
-
-    device = response.body
+    device = device_ref(device_id)
 
     response = app.control_client.read(device, service_id, char_id)
     return response.body.model_dump_json() if response.body else ""
@@ -499,15 +589,7 @@ def write_characteristic(device_id: str, service_id: str, char_id: str):
     if request.json is None:
         return ""
 
-    response = app.onboarding_client.get_device(device_id)
-
-    if response.status_code != 200 or response.body is None:
-        return render_template(
-            "error.html",
-            error="Failed to get device"
-        )
-
-    device = response.body
+    device = device_ref(device_id)
 
     value: str = request.json["value"]
     response = app.control_client.write(device, service_id, char_id, value)
@@ -541,9 +623,7 @@ def write_property(device_id):
 
     property_name = request.json["sdfName"]
     value_b64 = request.json["value"]
-    print(value_b64)
-    value_in_bytes = base64.b64decode(value_b64)
-    print(value_in_bytes)
+    app_logger.debug("Writing %s = %s", property_name, value_b64)
     response = app.control_client.write_property(device_id, property_name, value_b64)
 
     return response.body.model_dump_json() if response.body else ""
@@ -577,7 +657,7 @@ def register_sdf_model(device_id: str):
     if response.status_code == 200 and response.body is not None and \
             len(response.body.root) > 0 and \
             any(sdf_name_resp.sdf_name == sdf_name for sdf_name_resp in response.body.root):
-        print(response.body)
+        app_logger.debug("SDF models: %s", response.body)
         encoded_ref = quote(sdf_name, safe='')
         response = app.control_client.update_sdf_model(encoded_ref, sdf_model)
     else:
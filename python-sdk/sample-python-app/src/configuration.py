@@ -47,6 +47,8 @@ class ClientConfig:
         self.oauth_token_endpoint = app.config.get('OAUTH_TOKEN_ENDPOINT')
         self.oauth_redirect_uri = app.config.get('OAUTH_REDIRECT_URI')
         self.oauth_scopes = app.config.get('OAUTH_SCOPES')
+        self._root_ca_b64: Optional[str] = None
+        self._data_app_ca_cert: Optional[str] = None
         if self.oauth_client_id is not None:
             # initialize authenticator with OAuth2
             if (self.oauth_auth_endpoint is None or self.oauth_token_endpoint is None or
@@ -118,22 +120,29 @@ class ClientConfig:
 
     def get_root_ca(self):
         """ Get the root CN from certificate. """
-        with open(self.client_ca_path, 'rb') as ca_stream:
-            cert = ca_stream.read()
-        cert = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_PEM, cert)
-        cert_der = OpenSSL.crypto.dump_certificate(OpenSSL.crypto.FILETYPE_ASN1, cert)
-        cert_base64 = base64.b64encode(cert_der).decode('utf-8')
-        return cert_base64
+        if self._root_ca_b64 is None:
+            with open(self.client_ca_path, 'rb') as ca_stream:
+                cert = ca_stream.read()
+            cert = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_PEM, cert)
+            cert_der = OpenSSL.crypto.dump_certificate(OpenSSL.crypto.FILETYPE_ASN1, cert)
+            self._root_ca_b64 = base64.b64encode(cert_der).decode('utf-8')
+        return self._root_ca_b64
+
+    def get_data_app_ca_cert(self) -> Optional[str]:
+        """ Get the PEM CA certificate of the external MQTT broker. """
+        if self._data_app_ca_cert is None and self.data_app_ca_cert_path is not None:
+            with open(self.data_app_ca_cert_path, 'r', encoding='utf-8') as ca_cert_file:
+                self._data_app_ca_cert = ca_cert_file.read()
+        return self._data_app_ca_cert
 
     def get_endpoint_apps(self, onboarding_client: OnboardingClient):
         """
         Returns the endpoint apps for the onboarding app.
         """
         http_response = onboarding_client.get_endpoint_apps()
-        endpoint_apps = http_response.body.resources or []
-        control_app = next((app for app in endpoint_apps
-                            if app.application_type == "deviceControl" and
-                            app.application_name == self.control_app_id), None)
+        endpoint_apps = {(app.application_type, app.application_name): app
+                         for app in http_response.body.resources or []}
+        control_app = endpoint_apps.get((EndpointAppType.DEVICE_CONTROL, self.control_app_id))
         if control_app is None and self.oauth_client_id is None:
             certificate_info = None
             if self.control_app_cert_path is not None and self.control_app_key_path is not None:
@@ -147,8 +156,7 @@ class ClientConfig:
                 application_type=EndpointAppType.DEVICE_CONTROL
             ))
             control_app = endpoint_app_response.body
-        data_app = next((app for app in endpoint_apps if app.application_type == "telemetry"
-                        and app.application_name == self.data_app_id), None)
+        data_app = endpoint_apps.get((EndpointAppType.TELEMETRY, self.data_app_id))
         if data_app is None:
             endpoint_app_response = onboarding_client.create_endpoint_app(EndpointApp(
                 application_name=self.data_app_id,
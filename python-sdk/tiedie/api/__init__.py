@@ -7,6 +7,7 @@
 """ TieDie Client classes """
 
 from .control_client import *
+from .async_control_client import *
 from .data_receiver_client import *
 from .onboarding_client import *
 from .http_client import *
@@ -0,0 +1,170 @@
+#!python
+# Copyright (c) 2023, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module defines an asyncio front-end for the control client, so that
+operations on many devices can be awaited together, e.g. with
+`asyncio.gather`, instead of being issued one after another.
+
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from typing import List, Optional, Sequence, Union
+
+from tiedie.models.ble import DataParameter
+from tiedie.models.requests import BleConnectRequest, SdfModel
+from tiedie.models.responses import (
+    DataAppRegistration,
+    NipcResponse,
+    ProblemDetails,
+    PropertyResponse,
+    EncodedPropertyResponse,
+    PropertyWriteResponse,
+    TiedieDeviceResponse,
+    TiedieEventResponse,
+    ValueResponse
+)
+from tiedie.models.scim import Device
+
+from .auth import Authenticator
+from .control_client import ControlClient
+
+
+class AsyncControlClient:
+    """ Performs IoT device control operations from asyncio code.
+
+    Each call is run by a ControlClient in a worker thread, over the
+    client's pooled keep-alive connections, so up to `max_workers` requests
+    are in flight at once while the event loop stays free.
+    """
+
+    def __init__(self, base_url: str, authenticator: Authenticator,
+                 max_workers: int = 32, cache_ttl: float = 0.0):
+        self.control_client = ControlClient(base_url, authenticator, cache_ttl)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="tiedie-control")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        # close() blocks until running calls finish, so keep it off the loop
+        await asyncio.to_thread(self.close)
+
+    def close(self):
+        """ Waits for running calls, then releases the worker threads and
+        connections. """
+        self._executor.shutdown(wait=True)
+        self.control_client.close()
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs))
+
+    async def connect(self, device: Device,
+                      request: Optional[BleConnectRequest] = None,
+                      retries=3) \
+            -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ See `ControlClient.connect`. """
+        return await self._run(self.control_client.connect, device, request, retries)
+
+    async def disconnect(self, device: Device) -> NipcResponse[Optional[TiedieDeviceResponse]]:
+        """ See `ControlClient.disconnect`. """
+        return await self._run(self.control_client.disconnect, device)
+
+    async def get_connection(self, device: Device) \
+            -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ See `ControlClient.get_connection`. """
+        return await self._run(self.control_client.get_connection, device)
+
+    async def discover(self, device: Device,
+                       request: Optional[BleConnectRequest] = None,
+                       retries=3) \
+            -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ See `ControlClient.discover`. """
+        return await self._run(self.control_client.discover, device, request, retries)
+
+    async def read(self, device: Device, service_id: str, characteristic_id: str) \
+            -> NipcResponse[Optional[ValueResponse]]:
+        """ See `ControlClient.read`. """
+        return await self._run(self.control_client.read, device, service_id, characteristic_id)
+
+    async def write(self, device: Device,
+                    service_id: str,
+                    characteristic_id: str,
+                    value: str) -> NipcResponse[Optional[ValueResponse]]:
+        """ See `ControlClient.write`. """
+        return await self._run(self.control_client.write,
+                               device, service_id, characteristic_id, value)
+
+    async def read_property(self, device: str, sdf_name: str, decode: bool = True) \
+            -> NipcResponse[Optional[Union[PropertyResponse, EncodedPropertyResponse,
+                                           ProblemDetails]]]:
+        """ See `ControlClient.read_property`. """
+        return await self._run(self.control_client.read_property, device, sdf_name, decode)
+
+    async def write_property(self, device: str, sdf_name: str, value: str) \
+            -> NipcResponse[Optional[List[Union[PropertyWriteResponse, ProblemDetails]]]]:
+        """ See `ControlClient.write_property`. """
+        return await self._run(self.control_client.write_property, device, sdf_name, value)
+
+    async def register_sdf_model(self, model: SdfModel):
+        """ See `ControlClient.register_sdf_model`. """
+        return await self._run(self.control_client.register_sdf_model, model)
+
+    async def update_sdf_model(self, sdf_name: str, model: SdfModel):
+        """ See `ControlClient.update_sdf_model`. """
+        return await self._run(self.control_client.update_sdf_model, sdf_name, model)
+
+    async def get_sdf_models(self):
+        """ See `ControlClient.get_sdf_models`. """
+        return await self._run(self.control_client.get_sdf_models)
+
+    async def get_sdf_model(self, sdf_name: str):
+        """ See `ControlClient.get_sdf_model`. """
+        return await self._run(self.control_client.get_sdf_model, sdf_name)
+
+    async def unregister_sdf_model(self, sdf_name: str):
+        """ See `ControlClient.unregister_sdf_model`. """
+        return await self._run(self.control_client.unregister_sdf_model, sdf_name)
+
+    async def get_data_app(self, data_app_id: str):
+        """ See `ControlClient.get_data_app`. """
+        return await self._run(self.control_client.get_data_app, data_app_id)
+
+    async def create_data_app(self, data_app_id: str, data_app: DataAppRegistration):
+        """ See `ControlClient.create_data_app`. """
+        return await self._run(self.control_client.create_data_app, data_app_id, data_app)
+
+    async def update_data_app(self, data_app_id: str, data_app: DataAppRegistration):
+        """ See `ControlClient.update_data_app`. """
+        return await self._run(self.control_client.update_data_app, data_app_id, data_app)
+
+    async def delete_data_app(self, data_app_id: str):
+        """ See `ControlClient.delete_data_app`. """
+        return await self._run(self.control_client.delete_data_app, data_app_id)
+
+    async def enable_event(self, device_id: str, event: str) -> NipcResponse[Optional[str]]:
+        """ See `ControlClient.enable_event`. """
+        return await self._run(self.control_client.enable_event, device_id, event)
+
+    async def disable_event(self, device_id: str, instance_id: str) -> NipcResponse[None]:
+        """ See `ControlClient.disable_event`. """
+        return await self._run(self.control_client.disable_event, device_id, instance_id)
+
+    async def get_event(self, device_id: str, instance_id: str) \
+            -> NipcResponse[Optional[List[TiedieEventResponse]]]:
+        """ See `ControlClient.get_event`. """
+        return await self._run(self.control_client.get_event, device_id, instance_id)
+
+    async def get_all_events(self, device_id: str) \
+            -> NipcResponse[Optional[List[TiedieEventResponse]]]:
+        """ See `ControlClient.get_all_events`. """
+        return await self._run(self.control_client.get_all_events, device_id)
@@ -13,11 +13,16 @@ registration processes.
 
 """
 
-from typing import List, Optional, Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import dataclasses
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
 import urllib.parse as url_parse
 
-from pydantic import RootModel
+from pydantic import BaseModel, RootModel
 
 from tiedie.models.ble import DataParameter
 from tiedie.models.requests import (
@@ -33,6 +38,7 @@ from tiedie.models.requests import (
 )
 from tiedie.models.responses import (
     BleDiscoverResponse,
+    EncodedPropertyResponse,
     ModelRegistrationResponse,
     ProblemDetails,
     PropertyResponse,
@@ -48,17 +54,131 @@ from tiedie.models.scim import Device
 from .auth import Authenticator
 from .http_client import AbstractHttpClient
 
+CallResult = TypeVar('CallResult')
+
+# SDF names and event names repeat across calls, so their encodings are cached
+_quote = functools.lru_cache(maxsize=4096)(url_parse.quote)
+
+_MODELS_ENDPOINT = "/registrations/models"
+
+_DATA_APPS_ENDPOINT = "/registrations/data-apps"
+
+# List response types, parametrized once instead of on every call
+_PropertyResponseList = RootModel[List[Union[PropertyResponse, ProblemDetails]]]
+_EncodedPropertyResponseList = RootModel[List[Union[EncodedPropertyResponse, ProblemDetails]]]
+_PropertyWriteResponseList = RootModel[List[Union[PropertyWriteResponse, ProblemDetails]]]
+_ModelRegistrationResponseList = RootModel[List[ModelRegistrationResponse]]
+_EventResponseList = RootModel[List[TiedieEventResponse]]
+
+_DEFAULT_CONNECT_REQUEST = BleConnectRequest()
+
+
+def _copy_response(response: CallResult) -> CallResult:
+    """ Copies a cached response, so callers can't change the cached one. """
+    if isinstance(response, BaseModel):
+        return response.model_copy(deep=True)
+    return dataclasses.replace(response, body=copy.deepcopy(response.body))
+
+
+@functools.lru_cache(maxsize=2048)
+def _property_protocol_map(service_id: str, characteristic_id: str) -> PropertyProtocolMap:
+    """ Protocol map of a GATT characteristic, shared by the requests that
+    address it; it is never modified after construction. """
+    return PropertyProtocolMap(ble=BlePropertyProtocolMap(
+        service_id=service_id,
+        characteristic_id=characteristic_id))
+
+
+# Upper bound on concurrent requests issued by the *_many methods
+MAX_BATCH_WORKERS = 32
+
 
 class ControlClient(AbstractHttpClient):
     """ Performs IoT device control and data management operations. """
 
-    def __init__(self, base_url: str, authenticator: Authenticator):
+    def __init__(self, base_url: str, authenticator: Authenticator, cache_ttl: float = 0.0):
+        """
+        Args:
+            base_url (str): Base URL of the NIPC API.
+            authenticator (Authenticator): Authenticator of the control app.
+            cache_ttl (float, optional): Seconds for which successful SDF model
+                and data app lookups are served from a local cache. Changes
+                made through this client invalidate it. Defaults to 0, which
+                disables the cache.
+        """
         super().__init__(base_url, "application/nipc+json", authenticator)
         self.base_url = base_url
         self.authenticator = authenticator
+        self.cache_ttl = cache_ttl
+        # endpoint -> (expiry, response)
+        self._get_cache: Dict[str, Tuple[float, Any]] = {}
+        # threads are only started once a *_many method is used
+        self._batch_executor = ThreadPoolExecutor(max_workers=MAX_BATCH_WORKERS,
+                                                  thread_name_prefix="tiedie-batch")
+
+    def close(self):
+        """ Waits for running batch calls, then closes the connections. """
+        self._batch_executor.shutdown(wait=True)
+        super().close()
+
+    def invalidate_cache(self, prefix: Optional[str] = None):
+        """ Drops cached lookups whose endpoint starts with `prefix`, or all
+        of them if no prefix is given. """
+        if prefix is None:
+            self._get_cache.clear()
+            return
+        for endpoint in [e for e in self._get_cache if e.startswith(prefix)]:
+            self._get_cache.pop(endpoint, None)
+
+    def _cached(self,
+                endpoint: str,
+                fetch: Callable[[], CallResult],
+                is_success: Callable[[CallResult], bool]) -> CallResult:
+        """ Returns a copy of the cached response for `endpoint`, or fetches
+        it and caches a copy if it succeeded. """
+        if self.cache_ttl <= 0:
+            return fetch()
+        cached = self._get_cache.get(endpoint)
+        if cached is not None and cached[0] > time.monotonic():
+            return _copy_response(cached[1])
+        response = fetch()
+        if is_success(response):
+            self._get_cache[endpoint] = (time.monotonic() + self.cache_ttl,
+                                         _copy_response(response))
+        return response
+
+    def _run_batch(self,
+                   method: Callable[..., CallResult],
+                   calls: Sequence[tuple]) -> List[CallResult]:
+        """ Runs `method` once per argument tuple concurrently over the pooled
+        session, returning the results in the order of `calls`. """
+        return list(self._batch_executor.map(lambda args: method(*args), calls))
+
+    @staticmethod
+    def _to_parameter_response(
+            ble_discover_response: NipcResponse[Optional[BleDiscoverResponse]],
+            device_id: str) -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ Maps a BLE discovery response to the device's data parameters.
+
+        The body is None if the request failed or nothing was discovered.
+        """
+        body = ble_discover_response.body
+        if ble_discover_response.is_success and isinstance(body, BleDiscoverResponse):
+            parameter_list = body.to_parameter_list(device_id)
+            if parameter_list:
+                return NipcResponse[Optional[Sequence[DataParameter]]](
+                    http=ble_discover_response.http,
+                    body=parameter_list
+                )
+
+        return NipcResponse[Optional[Sequence[DataParameter]]](
+            http=ble_discover_response.http,
+            error=ble_discover_response.error,
+            body=None
+        )
 
     def connect(self, device: Device,
-                request: BleConnectRequest = BleConnectRequest(),
+                request: Optional[BleConnectRequest] = None,
                 retries=3) \
             -> NipcResponse[Optional[Sequence[DataParameter]]]:
         """Initiates a connection with an IoT device and retrieves GATT
@@ -67,7 +187,7 @@ class ControlClient(AbstractHttpClient):
         Args:
             device (Device): The device to connect to.
             request (BleConnectRequest, optional): The connection request object.
-                Defaults to None.
+                Defaults to an empty BleConnectRequest.
             retries (int, optional): The number of times to retry the connection.
                 Defaults to 3.
 
@@ -84,29 +204,14 @@ class ControlClient(AbstractHttpClient):
             raise ValueError("Device ID is required for connection")
 
         tiedie_request = TiedieConnectRequest(
-            protocol_information=BleProtocolInformation(ble=request),
+            protocol_information=BleProtocolInformation(
+                ble=request if request is not None else _DEFAULT_CONNECT_REQUEST),
             retries=retries
         )
 
         ble_discover_response = self.post_with_nipc_response(
             f'/devices/{device.device_id}/connections', tiedie_request, BleDiscoverResponse)
-
-        # Handle success case: extract parameter list from BLE discovery response
-        if (ble_discover_response.is_success and
-                isinstance(ble_discover_response.body, BleDiscoverResponse)):
-            parameter_list = ble_discover_response.body.to_parameter_list(device.device_id)
-            if parameter_list:
-                return NipcResponse[Optional[Sequence[DataParameter]]](
-                    http=ble_discover_response.http,
-                    body=parameter_list
-                )
-
-        # Handle error case or empty response
-        return NipcResponse[Optional[Sequence[DataParameter]]](
-            http=ble_discover_response.http,
-            error=ble_discover_response.error,
-            body=None
-        )
+        return self._to_parameter_response(ble_discover_response, device.device_id)
 
     def disconnect(self, device: Device) -> NipcResponse[Optional[TiedieDeviceResponse]]:
         """ Disconnects from a connected IoT device. """
@@ -131,26 +236,10 @@ class ControlClient(AbstractHttpClient):
             f'/devices/{device.device_id}/connections',
             None, BleDiscoverResponse
         )
-
-        # Handle success case: extract parameter list from BLE discovery response
-        if (ble_discover_response.is_success and
-                isinstance(ble_discover_response.body, BleDiscoverResponse)):
-            parameter_list = ble_discover_response.body.to_parameter_list(device.device_id)
-            if parameter_list:
-                return NipcResponse[Optional[Sequence[DataParameter]]](
-                    http=ble_discover_response.http,
-                    body=parameter_list
-                )
-
-        # Handle error case or empty response
-        return NipcResponse[Optional[Sequence[DataParameter]]](
-            http=ble_discover_response.http,
-            error=ble_discover_response.error,
-            body=None
-        )
+        return self._to_parameter_response(ble_discover_response, device.device_id)
 
     def discover(self, device: Device,
-                 request: BleConnectRequest = BleConnectRequest(),
+                 request: Optional[BleConnectRequest] = None,
                  retries=3) \
             -> NipcResponse[Optional[Sequence[DataParameter]]]:
         """Discovers services and characteristics of an IoT device.
@@ -161,7 +250,7 @@ class ControlClient(AbstractHttpClient):
         Args:
             device (Device): The device to discover.
             request (BleConnectRequest, optional): The connection request object.
-                Defaults to None.
+                Defaults to an empty BleConnectRequest.
             retries (int, optional): The number of times to retry the connection.
 
         Returns:
@@ -173,29 +262,14 @@ class ControlClient(AbstractHttpClient):
             raise ValueError("Device ID is required for connection")
 
         tiedie_request = TiedieConnectRequest(
-            protocol_information=BleProtocolInformation(ble=request),
+            protocol_information=BleProtocolInformation(
+                ble=request if request is not None else _DEFAULT_CONNECT_REQUEST),
             retries=retries
         )
 
         ble_discover_response = self.put_with_nipc_response(
             f'/devices/{device.device_id}/connections', tiedie_request, BleDiscoverResponse)
-
-        # Handle success case: extract parameter list from BLE discovery response
-        if ble_discover_response.is_success and \
-            isinstance(ble_discover_response.body, BleDiscoverResponse):
-            parameter_list = ble_discover_response.body.to_parameter_list(device.device_id)
-            if parameter_list:
-                return NipcResponse[Optional[Sequence[DataParameter]]](
-                    http=ble_discover_response.http,
-                    body=parameter_list
-                )
-
-        # Handle error case or empty response
-        return NipcResponse[Optional[Sequence[DataParameter]]](
-            http=ble_discover_response.http,
-            error=ble_discover_response.error,
-            body=None
-        )
+        return self._to_parameter_response(ble_discover_response, device.device_id)
 
     def read(self, device: Device, service_id: str, characteristic_id: str) \
             -> NipcResponse[Optional[ValueResponse]]:
@@ -210,11 +284,8 @@ class ControlClient(AbstractHttpClient):
         Returns:
             NipcResponse[Optional[ValueResponse]]: The NIPC response object containing the value.
         """
-        tiedie_request = \
-            TiedieReadRequest(sdf_protocol_map=PropertyProtocolMap(
-                ble=BlePropertyProtocolMap(
-                    service_id=service_id,
-                    characteristic_id=characteristic_id)))
+        tiedie_request = TiedieReadRequest(
+            sdf_protocol_map=_property_protocol_map(service_id, characteristic_id))
         return self.post_with_nipc_response(f"/extensions/{device.device_id}/properties/read",
                                            tiedie_request, ValueResponse)
 
@@ -234,32 +305,36 @@ class ControlClient(AbstractHttpClient):
         Returns:
             NipcResponse[Optional[ValueResponse]]: The NIPC response object containing the value.
         """
-        tiedie_request = TiedieWriteRequest(sdf_protocol_map=PropertyProtocolMap(
-                ble=BlePropertyProtocolMap(
-                    service_id=service_id,
-                    characteristic_id=characteristic_id)),
-                                            value=value)
+        tiedie_request = TiedieWriteRequest(
+            sdf_protocol_map=_property_protocol_map(service_id, characteristic_id),
+            value=value)
         endpoint = f"/extensions/{device.device_id}/properties/write"
         return self.post_with_nipc_response(endpoint, tiedie_request, ValueResponse)
 
     def read_property(self,
                       device: str,
-                      sdf_name: str) -> NipcResponse[
-                          Optional[Union[PropertyResponse, ProblemDetails]]
+                      sdf_name: str,
+                      decode: bool = True) -> NipcResponse[
+                          Optional[Union[PropertyResponse, EncodedPropertyResponse,
+                                         ProblemDetails]]
                       ]:
         """ Reads a property from a device.
 
         Args:
             device (str): The device to read from.
             sdf_name (str): The SDF reference of an SDF property to read.
+            decode (bool): Whether to base64-decode the values. If False, the
+                values are returned as sent by the gateway, in
+                EncodedPropertyResponse objects.
 
         Returns:
-            NipcResponse[Optional[Union[PropertyResponse, ProblemDetails]]]:
+            NipcResponse[Optional[Union[PropertyResponse, EncodedPropertyResponse,
+                ProblemDetails]]]:
                 The NIPC response object containing the value of the property.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
+        encoded_sdf_name = _quote(sdf_name)
         endpoint = f"/devices/{device}/properties?propertyName={encoded_sdf_name}"
-        response_type = RootModel[List[Union[PropertyResponse, ProblemDetails]]]
+        response_type = _PropertyResponseList if decode else _EncodedPropertyResponseList
         return self.get_with_nipc_response(endpoint, None, response_type)
 
     def write_property(self,
@@ -282,7 +357,7 @@ class ControlClient(AbstractHttpClient):
         return self.put_with_nipc_response(
             f"/devices/{device}/properties",
             [PropertyWriteRequest(property=sdf_name, value=value)],
-            RootModel[List[Union[PropertyWriteResponse, ProblemDetails]]]
+            _PropertyWriteResponseList
         )
 
 
@@ -297,9 +372,11 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.post_with_nipc_response("/registrations/models",
-                                              model, RootModel[List[ModelRegistrationResponse]],
-                                              "application/sdf+json")
+        response = self.post_with_nipc_response(_MODELS_ENDPOINT,
+                                                model, _ModelRegistrationResponseList,
+                                                "application/sdf+json")
+        self.invalidate_cache(_MODELS_ENDPOINT)
+        return response
 
     def update_sdf_model(self, sdf_name: str, model: SdfModel):
         """ Updates a SDF model for an IoT device.
@@ -312,10 +389,12 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
-        return self.put_with_nipc_response(f"/registrations/models?sdfName={encoded_sdf_name}",
-                                              model, ModelRegistrationResponse,
-                                              "application/sdf+json")
+        encoded_sdf_name = _quote(sdf_name)
+        response = self.put_with_nipc_response(
+            f"{_MODELS_ENDPOINT}?sdfName={encoded_sdf_name}",
+            model, ModelRegistrationResponse, "application/sdf+json")
+        self.invalidate_cache(_MODELS_ENDPOINT)
+        return response
 
 
     def get_sdf_models(self):
@@ -328,8 +407,10 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.get("/registrations/models",
-                            RootModel[List[ModelRegistrationResponse]])
+        return self._cached(
+            _MODELS_ENDPOINT,
+            lambda: self.get(_MODELS_ENDPOINT, _ModelRegistrationResponseList),
+            lambda response: response.status_code == 200)
 
     def get_sdf_model(self, sdf_name: str):
         """ Retrieves the SDF model registered for an IoT device.
@@ -342,8 +423,11 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
-        return self.get(f"/registrations/models?sdfName={encoded_sdf_name}", SdfModel)
+        endpoint = f"{_MODELS_ENDPOINT}?sdfName={_quote(sdf_name)}"
+        return self._cached(
+            endpoint,
+            lambda: self.get(endpoint, SdfModel),
+            lambda response: response.status_code == 200)
 
     def unregister_sdf_model(self, sdf_name: str):
         """ Unregisters a SDF model for an IoT device.
@@ -356,9 +440,12 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
-        return self.delete_with_nipc_response(f"/registrations/models?sdfName={encoded_sdf_name}",
-                                                None, ModelRegistrationResponse)
+        encoded_sdf_name = _quote(sdf_name)
+        response = self.delete_with_nipc_response(
+            f"{_MODELS_ENDPOINT}?sdfName={encoded_sdf_name}",
+            None, ModelRegistrationResponse)
+        self.invalidate_cache(_MODELS_ENDPOINT)
+        return response
 
     def get_data_app(self, data_app_id: str):
         """ Retrieves the data app for an IoT device.
@@ -370,11 +457,11 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.get_with_nipc_response(
-            f"/registrations/data-apps?dataAppId={data_app_id}",
-            None,
-            DataAppRegistration
-        )
+        endpoint = f"{_DATA_APPS_ENDPOINT}?dataAppId={data_app_id}"
+        return self._cached(
+            endpoint,
+            lambda: self.get_with_nipc_response(endpoint, None, DataAppRegistration),
+            lambda response: response.is_success)
 
     def create_data_app(self, data_app_id: str, data_app: DataAppRegistration):
         """ Creates a data app for an IoT device.
@@ -386,8 +473,11 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.post_with_nipc_response(f"/registrations/data-apps?dataAppId={data_app_id}",
-                                              data_app, DataAppRegistration)
+        response = self.post_with_nipc_response(
+            f"{_DATA_APPS_ENDPOINT}?dataAppId={data_app_id}",
+            data_app, DataAppRegistration)
+        self.invalidate_cache(_DATA_APPS_ENDPOINT)
+        return response
 
     def update_data_app(self, data_app_id: str, data_app: DataAppRegistration):
         """ Updates a data app for an IoT device.
@@ -399,8 +489,11 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.put_with_nipc_response(f"/registrations/data-apps?dataAppId={data_app_id}",
-                                              data_app, DataAppRegistration)
+        response = self.put_with_nipc_response(
+            f"{_DATA_APPS_ENDPOINT}?dataAppId={data_app_id}",
+            data_app, DataAppRegistration)
+        self.invalidate_cache(_DATA_APPS_ENDPOINT)
+        return response
 
     def delete_data_app(self, data_app_id: str):
         """ Deletes a data app for an IoT device.
@@ -412,8 +505,11 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.delete_with_nipc_response(f"/registrations/data-apps?dataAppId={data_app_id}",
-                                                None, DataAppRegistration)
+        response = self.delete_with_nipc_response(
+            f"{_DATA_APPS_ENDPOINT}?dataAppId={data_app_id}",
+            None, DataAppRegistration)
+        self.invalidate_cache(_DATA_APPS_ENDPOINT)
+        return response
 
     def enable_event(self,
                      device_id: str,
@@ -427,13 +523,16 @@ class ControlClient(AbstractHttpClient):
         Returns:
             NipcResponse[Optional[str]]: NIPC response object.
         """
-        encoded_sdf_name = url_parse.quote(event)
+        encoded_sdf_name = _quote(event)
         resp = self.post_with_nipc_response(
             f"/devices/{device_id}/events?eventName={encoded_sdf_name}",
             None,
             None
         )
-        resp.body = resp.http.headers.get('Location').split('?instanceId=')[1]
+        # error responses carry no Location header
+        location = resp.http.headers.get('Location', '') if resp.http else ''
+        _, found, instance_id = location.partition('?instanceId=')
+        resp.body = instance_id if found else None
         return resp
 
     def disable_event(self,
@@ -468,7 +567,7 @@ class ControlClient(AbstractHttpClient):
         return self.get_with_nipc_response(
             f"/devices/{device_id}/events?instanceId={instance_id}",
             None,
-            RootModel[List[TiedieEventResponse]]
+            _EventResponseList
         )
 
     def get_all_events(
@@ -483,5 +582,59 @@ class ControlClient(AbstractHttpClient):
             NipcResponse[Optional[List[TiedieEventResponse]]]: NIPC response object.
         """
         endpoint = f"/devices/{device_id}/events"
-        response_type = RootModel[List[TiedieEventResponse]]
+        response_type = _EventResponseList
         return self.get_with_nipc_response(endpoint, None, response_type)
+
+    def read_many(self, reads: Sequence[Tuple[Device, str, str]]) \
+            -> List[NipcResponse[Optional[ValueResponse]]]:
+        """ Reads GATT characteristics of several devices concurrently.
+
+        Args:
+            reads (Sequence[Tuple[Device, str, str]]): (device, service ID,
+                characteristic ID) of each characteristic to read.
+
+        Returns:
+            List[NipcResponse[Optional[ValueResponse]]]: One response per read,
+                in the order of `reads`.
+        """
+        return self._run_batch(self.read, reads)
+
+    def write_many(self, writes: Sequence[Tuple[Device, str, str, str]]) \
+            -> List[NipcResponse[Optional[ValueResponse]]]:
+        """ Writes GATT characteristics of several devices concurrently.
+
+        Args:
+            writes (Sequence[Tuple[Device, str, str, str]]): (device, service ID,
+                characteristic ID, value) of each characteristic to write.
+
+        Returns:
+            List[NipcResponse[Optional[ValueResponse]]]: One response per write,
+                in the order of `writes`.
+        """
+        return self._run_batch(self.write, writes)
+
+    def enable_event_many(self, events: Sequence[Tuple[str, str]]) \
+            -> List[NipcResponse[Optional[str]]]:
+        """ Enables events on several devices concurrently.
+
+        Args:
+            events (Sequence[Tuple[str, str]]): (device ID, event name) pairs.
+
+        Returns:
+            List[NipcResponse[Optional[str]]]: One response per event, in the
+                order of `events`.
+        """
+        return self._run_batch(self.enable_event, events)
+
+    def get_event_many(self, events: Sequence[Tuple[str, str]]) \
+            -> List[NipcResponse[Optional[List[TiedieEventResponse]]]]:
+        """ Retrieves the status of several events concurrently.
+
+        Args:
+            events (Sequence[Tuple[str, str]]): (device ID, instance ID) pairs.
+
+        Returns:
+            List[NipcResponse[Optional[List[TiedieEventResponse]]]]: One response
+                per event, in the order of `events`.
+        """
+        return self._run_batch(self.get_event, events)
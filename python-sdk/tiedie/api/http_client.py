@@ -12,11 +12,15 @@ and mapping them to specific classes, particularly for IoT applications.
 """
 
 from enum import Enum
+from functools import lru_cache
 import json
+from types import MappingProxyType
 import logging
 from typing import Optional, Type, TypeVar, Union, List
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, SerializeAsAny, TypeAdapter, ValidationError
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tiedie.api.auth import Authenticator
 from tiedie.models.responses import (
     HttpResponse,
@@ -31,14 +35,56 @@ NipcReturnClass = TypeVar('NipcReturnClass', bound=BaseModel)
 
 logger = logging.getLogger('tiedie')
 
+# Serializes each item by its runtime class rather than as a bare BaseModel
+_MODEL_LIST_ADAPTER = TypeAdapter(List[SerializeAsAny[BaseModel]])
+
+# Connections are kept alive in the session's pool, so repeated calls to the
+# same gateway reuse the TCP/TLS connection instead of handshaking again
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+CONNECT_RETRIES = 3
+
+
+@lru_cache(maxsize=None)
+def _default_headers(media_type: str) -> MappingProxyType:
+    """ Read-only template of the default headers for a media type """
+    return MappingProxyType({"Content-Type": media_type})
+
+
 class AbstractHttpClient:
     """ class AbstractHttpClient """
 
     def __init__(self, base_url, media_type, authenticator: Authenticator):
         self.base_url = base_url
         self.media_type = media_type
-        self.headers = {"Content-Type": self.media_type}
-        self.http_client = authenticator.set_auth_options(requests.Session())
+        self.headers = dict(_default_headers(media_type))
+        self.http_client = authenticator.set_auth_options(self._new_session())
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """ Session with a connection pool sized for concurrent callers """
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            # only retry failed connects; a request that reached the
+            # gateway must not be replayed
+            max_retries=Retry(total=CONNECT_RETRIES, connect=CONNECT_RETRIES,
+                              read=0, status=0, backoff_factor=0.1),
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """ Closes the pooled connections of the client. """
+        self.http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
 
     def _map_response(self,
                       response: requests.Response,
@@ -46,23 +92,24 @@ class AbstractHttpClient:
             -> HttpResponse[ReturnClass | None]:
         """ Map response to object """
         if return_class is None:
-            return HttpResponse[ReturnClass | None](
+            return HttpResponse(
                 response.status_code,
                 response.reason,
                 None
             )
 
-        logger.debug("Response HTTP status %d", response.status_code)
-        logger.debug("Response headers: %s", response.headers)
-        logger.debug("Response: %s", response.text)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response HTTP status %d", response.status_code)
+            logger.debug("Response headers: %s", response.headers)
+            # .text decodes (and may sniff the charset of) the whole body
+            logger.debug("Response: %s", response.text)
 
         try:
-            body = return_class.model_validate_json(
-                response.text)
+            body = return_class.model_validate_json(response.content)
         except (ValueError, ValidationError):
             body = None
 
-        return HttpResponse[ReturnClass | None](
+        return HttpResponse(
             response.status_code,
             response.reason,
             body
@@ -75,12 +122,15 @@ class AbstractHttpClient:
         """ API POST """
         data = body.model_dump_json(by_alias=True, exclude_none=True)
 
-        logger.debug("POST %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Body: %s", data)
+        url = self.base_url + path
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("POST %s", url)
+            logger.debug("Headers: %s", self.headers)
+            logger.debug("Body: %s", data)
 
         response = self.http_client.post(
-            self.base_url + path,
+            url,
             data=data,
             headers=self.headers,
             verify=False,
@@ -95,12 +145,15 @@ class AbstractHttpClient:
         """ API PUT """
         data = body.model_dump_json(by_alias=True, exclude_none=True)
 
-        logger.debug("PUT %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Body: %s", data)
+        url = self.base_url + path
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PUT %s", url)
+            logger.debug("Headers: %s", self.headers)
+            logger.debug("Body: %s", data)
 
         response = self.http_client.put(
-            self.base_url + path,
+            url,
             data=data,
             headers=self.headers,
             verify=False,
@@ -113,11 +166,14 @@ class AbstractHttpClient:
             return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
         """ API GET """
 
-        logger.debug("GET %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
+        url = self.base_url + path
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GET %s", url)
+            logger.debug("Headers: %s", self.headers)
 
         response = self.http_client.get(
-            self.base_url + path,
+            url,
             headers=self.headers,
             verify=False,
 
@@ -130,11 +186,14 @@ class AbstractHttpClient:
             -> HttpResponse[ReturnClass | None]:
         """ API DELETE """
 
-        logger.debug("DELETE %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
+        url = self.base_url + path
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DELETE %s", url)
+            logger.debug("Headers: %s", self.headers)
 
         response = self.http_client.delete(
-            self.base_url + path,
+            url,
             headers=self.headers,
             verify=False,
         )
@@ -150,14 +209,17 @@ class AbstractHttpClient:
         Handles both success responses (HTTP 200 with JSON) and error responses
         (HTTP 4xx/5xx with Problem Details format).
         """
-        http = TiedieHTTP(
+        # trusted values straight from requests; the case-insensitive header
+        # mapping is kept as-is instead of being copied into a dict
+        http = TiedieHTTP.model_construct(
             status_code=response.status_code,
             status_message=response.reason,
-            headers=dict(response.headers)
+            headers=response.headers
         )
 
-        logger.debug("Response headers: %s", response.headers)
-        logger.debug("Response: %s", response.text)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response headers: %s", response.headers)
+            logger.debug("Response: %s", response.text)
 
         # Check for error status codes (4xx, 5xx)
         if response.status_code >= 400:
@@ -175,10 +237,10 @@ class AbstractHttpClient:
         try:
             if 'application/problem+json' in content_type:
                 # Parse RFC 9457 Problem Details format
-                problem_details = ProblemDetails.model_validate_json(response.text)
+                problem_details = ProblemDetails.model_validate_json(response.content)
                 return NipcResponse[None](http=http, error=problem_details)
             # Fallback: try to parse as JSON and extract error info
-            error_data = json.loads(response.text) if response.text else {}
+            error_data = json.loads(response.content) if response.content else {}
             problem_details = ProblemDetails(
                 type="about:blank",  # RFC 9457 default for generic errors
                 status=response.status_code,
@@ -206,7 +268,7 @@ class AbstractHttpClient:
         if return_class is None:
             return NipcResponse[None](http=http, body=None)
         try:
-            body = return_class.model_validate_json(response.text)
+            body = return_class.model_validate_json(response.content)
             return NipcResponse[Optional[NipcReturnClass]](http=http, body=body)
         except (ValueError, ValidationError) as e:
             logger.debug("Error parsing success response: %s", e)
@@ -226,23 +288,25 @@ class AbstractHttpClient:
         object_map = body.model_dump(by_alias=True, exclude_none=True)
         query_parameters = []
 
-        stack = list(object_map.items())
+        append = query_parameters.append
+
+        # depth-first in declaration order: items are pushed in reverse so
+        # that they pop in order, and no final reversal is needed
+        stack = list(reversed(object_map.items()))
 
         while stack:
             key, value = stack.pop()
             if isinstance(value, Enum):
                 value = value.value
             if isinstance(value, dict):
-                for sub_key, sub_value in value.items():
-                    stack.append((key + "[" + sub_key + "]", sub_value))
+                stack.extend((f"{key}[{sub_key}]", sub_value)
+                             for sub_key, sub_value in reversed(value.items()))
             elif isinstance(value, list):
-                query_parameters.append((key, ",".join(value)))
+                append((key, ",".join(value)))
             elif isinstance(value, bool):
-                query_parameters.append((key, json.dumps(value)))
+                append((key, "true" if value else "false"))
             else:
-                query_parameters.append((key, str(value)))
-
-        query_parameters.reverse()
+                append((key, str(value)))
 
         return query_parameters
 
@@ -259,15 +323,9 @@ class AbstractHttpClient:
             return None
 
         if isinstance(body, list):
-            # Handle list of BaseModel instances
-            return '[' + \
-                ','.join([
-                    item.model_dump_json(
-                        by_alias=True,
-                        exclude_none=True
-                    ) for item in body
-                ]) + \
-                ']'
+            # Handle list of BaseModel instances in one serializer call
+            return _MODEL_LIST_ADAPTER.dump_json(
+                body, by_alias=True, exclude_none=True).decode()
         return body.model_dump_json(by_alias=True, exclude_none=True)
 
     def post_with_nipc_response(self,
@@ -280,16 +338,20 @@ class AbstractHttpClient:
 
         data = self._serialize_body(body)
 
-        self.headers['Content-Type'] = content_type
+        # per-call copy; the client headers may be in use by other threads
+        headers = {**self.headers, 'Content-Type': content_type}
+
+        url = self.base_url + path
 
-        logger.debug("POST %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Body: %s", data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("POST %s", url)
+            logger.debug("Headers: %s", headers)
+            logger.debug("Body: %s", data)
 
         response = self.http_client.post(
-            self.base_url + path,
+            url,
             data=data,
-            headers=self.headers,
+            headers=headers,
             verify=False,
         )
 
@@ -306,16 +368,20 @@ class AbstractHttpClient:
 
         data = self._serialize_body(body)
 
-        self.headers['Content-Type'] = content_type
+        # per-call copy; the client headers may be in use by other threads
+        headers = {**self.headers, 'Content-Type': content_type}
+
+        url = self.base_url + path
 
-        logger.debug("PUT %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Body: %s", data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PUT %s", url)
+            logger.debug("Headers: %s", headers)
+            logger.debug("Body: %s", data)
 
         response = self.http_client.put(
-            self.base_url + path,
+            url,
             data=data,
-            headers=self.headers,
+            headers=headers,
             verify=False,
         )
 
@@ -332,12 +398,15 @@ class AbstractHttpClient:
 
         params = self._get_query_parameters(body)
 
-        logger.debug("GET %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Params: %s", params)
+        url = self.base_url + path
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GET %s", url)
+            logger.debug("Headers: %s", self.headers)
+            logger.debug("Params: %s", params)
 
         response = self.http_client.get(
-            self.base_url + path,
+            url,
             headers=self.headers,
             params=params,
             verify=False,
@@ -355,12 +424,15 @@ class AbstractHttpClient:
 
         params = self._get_query_parameters(body)
 
-        logger.debug("DELETE %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Params: %s", params)
+        url = self.base_url + path
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DELETE %s", url)
+            logger.debug("Headers: %s", self.headers)
+            logger.debug("Params: %s", params)
 
         response = self.http_client.delete(
-            self.base_url + path,
+            url,
             params=params,
             headers=self.headers,
             verify=False,
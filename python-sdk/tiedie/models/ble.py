@@ -13,10 +13,9 @@ communication.
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
-from pydantic.alias_generators import to_camel
+from pydantic import BaseModel, Field
 
-from .common import DataParameter, RegistrationOptions
+from .common import _CAMEL_CONFIG, DataParameter, RegistrationOptions
 
 
 class BleReadRequest(BaseModel):
@@ -24,7 +23,7 @@ class BleReadRequest(BaseModel):
     Represents a request for reading data from a BLE device.
     It includes service_uuid and characteristic_uuid.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     service_id: str = Field(alias=str("serviceID"))
     characteristic_id: str = Field(alias=str("characteristicID"))
@@ -35,7 +34,7 @@ class BleSubscribeRequest(BaseModel):
     Represents a request for subscribing to data from a BLE device. 
     It includes serviceUUID and characteristicUUID.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     service_id: str
     characteristic_id: str
@@ -43,14 +42,14 @@ class BleSubscribeRequest(BaseModel):
 
 class BleDescriptors(BaseModel):
     """ Represents a BLE descriptor. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     descriptor_id: str = Field(alias=str("descriptorID"))
 
 
 class BleCharacteristic(BaseModel):
     """ Represents a BLE characteristic. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     characteristic_id: str = Field(alias=str("characteristicID"))
     flags: List[str]
@@ -59,7 +58,7 @@ class BleCharacteristic(BaseModel):
 
 class BleService(BaseModel):
     """ Represents a BLE service. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     service_id: str = Field(alias=str("serviceID"))
     characteristics: Optional[List[BleCharacteristic]] = None
@@ -79,7 +78,7 @@ class BleConnectRequest(BaseModel):
     Represents a request for establishing a connection with BLE devices.
     It includes protocol information and cache behavior settings.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     services: Optional[List[BleService]] = None
     cached: Optional[bool] = None
@@ -104,7 +103,7 @@ class BleWriteRequest(BaseModel):
     Represents a request for writing data to a BLE device. 
     It includes service_uuid, characteristic_uuid, and value. 
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     service_id: str = Field(alias=str("serviceID"))
     characteristic_id: str = Field(alias=str("characteristicID"))
@@ -124,7 +123,7 @@ class BleAdvertisementFilter(BaseModel):
     Represents a filter for BLE advertisements, including mac,
     adType, and adData.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     mac: str
     ad_type: str
@@ -143,7 +142,7 @@ class BleTopicType(Enum):
 
 class BleRegisterTopicRequest(BaseModel):
     """ A request class for registering topic to BLE devices. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     type: BleTopicType = Field(alias=str("type"))
 
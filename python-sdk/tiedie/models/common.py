@@ -15,6 +15,9 @@ from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 
+# Shared by the camelCase wire models; pydantic copies it into each class
+_CAMEL_CONFIG = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+
 
 class NipcErrorCodes(IntEnum):
     """
@@ -65,7 +68,7 @@ class ListResponse(BaseModel, Generic[Resource]):
     A class representing a list response with attributes for totalResults,
     startIndex, itemsPerPage, and resources.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     total_results: int
     start_index: Optional[int] = None
@@ -78,7 +81,7 @@ class RegistrationOptions(BaseModel):
     """
     A class representing registration options for IoT devices.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     data_apps: Optional[List[str]] = Field(alias=str("dataApps"), default=None)
 
@@ -98,6 +101,6 @@ class ConnectionRegistrationOptions(RegistrationOptions):
 
 class DataApp(BaseModel):
     """ A class representing a data app. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     data_app_id: str = Field(alias=str("dataAppID"))
@@ -13,13 +13,13 @@ using BLE and Zigbee technologies.
 
 from typing import Optional
 
-from pydantic import Base64Bytes, BaseModel, ConfigDict, Field
-from pydantic.alias_generators import to_camel
+from pydantic import Base64Bytes, BaseModel, Field
 from tiedie.models.ble import (BleConnectRequest, BleTopicType)
+from tiedie.models.common import _CAMEL_CONFIG
 
 class BlePropertyProtocolMap(BaseModel):
     """ Object with BLE property protocol map """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     service_id: str = Field(alias=str("serviceID"))
     characteristic_id: str = Field(alias=str("characteristicID"))
@@ -27,7 +27,7 @@ class BlePropertyProtocolMap(BaseModel):
 
 class PropertyProtocolMap(BaseModel):
     """ Object with protocol map for property """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     ble: BlePropertyProtocolMap
 
@@ -37,7 +37,7 @@ class TiedieReadRequest(BaseModel):
     A request for reading data from IoT devices, with support for both
     BLE and Zigbee technologies. 
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     sdf_protocol_map: PropertyProtocolMap
 
@@ -52,7 +52,7 @@ class TiedieWriteRequest(TiedieReadRequest):
 
 class BleProtocolInformation(BaseModel):
     """ Object with BLE protocol information """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     ble: BleConnectRequest
 
@@ -61,14 +61,14 @@ class TiedieConnectRequest(BaseModel):
     A request class for establishing a connection with BLE devices,
     primarily used for BLE technology.
     """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     protocol_information: BleProtocolInformation
     retries: Optional[int] = 3
 
 class SdfProperty(BaseModel):
     """ Object with SDF property """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     description: Optional[str] = None
     observable: Optional[bool] = True
@@ -78,7 +78,7 @@ class SdfProperty(BaseModel):
 
 class GattEventProtocolMap(BaseModel):
     """ Object with GATT event protocol map """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     type: str = Field(alias=str("type"), default=BleTopicType.GATT)
     service_id: str = Field(alias=str("serviceID"))
@@ -86,32 +86,32 @@ class GattEventProtocolMap(BaseModel):
 
 class AdvertisementEventProtocolMap(BaseModel):
     """ Object with advertisement event protocol map """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     type: str = Field(alias=str("type"), default=BleTopicType.ADVERTISEMENTS)
 
 class ConnectionEventProtocolMap(BaseModel):
     """ Object with connection event protocol map """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     type: str = Field(alias=str("type"), default=BleTopicType.CONNECTION_EVENTS)
 
 
 class EventProtocolMap(BaseModel):
     """ Object with event protocol map """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     ble: GattEventProtocolMap | AdvertisementEventProtocolMap | ConnectionEventProtocolMap
 
 class SdfOutputData(BaseModel):
     """ Object with SDF output data """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     type: Optional[str] = None
 
 class SdfEvent(BaseModel):
     """ Object with SDF event """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     description: Optional[str] = None
     sdf_protocol_map: EventProtocolMap
@@ -119,14 +119,14 @@ class SdfEvent(BaseModel):
 
 class SdfAction(BaseModel):
     """ Object with SDF action """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     description: Optional[str] = None
     sdf_protocol_map: PropertyProtocolMap
 
 class SdfObject(BaseModel):
     """ Object with SDF object """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     description: Optional[str] = None
     sdf_property: Optional[dict[str, SdfProperty]] = None
@@ -135,13 +135,13 @@ class SdfObject(BaseModel):
 
 class SdfThing(SdfObject):
     """ Object with SDF thing """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     sdf_object: Optional[dict[str, SdfObject]] = None
 
 class SdfModel(BaseModel):
     """ Object with SDF model """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     namespace: dict[str, str]
     default_namespace: str
@@ -151,7 +151,7 @@ class SdfModel(BaseModel):
 
 class PropertyWriteRequest(BaseModel):
     """ Object with property write request """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     property: str = Field(alias=str("property"))
     value: Base64Bytes
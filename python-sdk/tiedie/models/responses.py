@@ -14,12 +14,17 @@ including handling Tiedie responses, data responses, and discovery-related intea
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
-from pydantic.alias_generators import to_camel
+from typing import Final, Generic, List, Mapping, Optional, TypeVar
 
-from pydantic import Base64Bytes, BaseModel, ConfigDict, Field
+from pydantic import Base64Bytes, BaseModel, ConfigDict, Field, field_serializer
 
 from tiedie.models.ble import BleDataParameter, BleService
+from tiedie.models.common import _CAMEL_CONFIG
+
+
+# Base URI for IANA HTTP Problem Types registry. Kept out of the enum body,
+# where it would otherwise become a member itself
+_IANA_BASE: Final[str] = "https://www.iana.org/assignments/nipc-problem-types#"
 
 
 class NipcProblemTypes(str, Enum):
@@ -28,9 +33,6 @@ class NipcProblemTypes(str, Enum):
     (https://datatracker.ietf.org/doc/html/draft-ietf-asdf-nipc-18)
     Section 6 and IANA registry Section 11.6.
     """
-    # Base URI for IANA HTTP Problem Types registry
-    _IANA_BASE = "https://www.iana.org/assignments/nipc-problem-types#"
-
     # Generic errors
     INVALID_ID = _IANA_BASE + "invalid-id"
     INVALID_SDF_URL = _IANA_BASE + "invalid-sdf-url"
@@ -83,11 +85,20 @@ class ProblemDetails(BaseModel):
     """
     model_config = ConfigDict(populate_by_name=True)
 
-    type: NipcProblemTypes = Field(..., description="URI identifying the problem type")
+    # kept as the gateway sent it; see type_enum for the NIPC problem type
+    type: str = Field(..., description="URI identifying the problem type")
     status: int = Field(..., description="HTTP status code")
     title: str = Field(..., description="Human-readable summary of the problem type")
     detail: Optional[str] = Field(None, description="Human-readable explanation of this occurrence")
 
+    @property
+    def type_enum(self) -> Optional[NipcProblemTypes]:
+        """ The NIPC problem type, or None for a type outside the registry """
+        try:
+            return NipcProblemTypes(self.type)
+        except ValueError:
+            return None
+
 
 class SuccessResponse(BaseModel):
     """Base class for successful NIPC responses.
@@ -103,7 +114,13 @@ class TiedieHTTP(BaseModel):
     """ TieDie HTTP """
     status_code: int
     status_message: str
-    headers: Optional[dict[str, str]] = None
+    headers: Optional[Mapping[str, str]] = None
+
+    @field_serializer('headers')
+    def serialize_headers(self, headers: Optional[Mapping[str, str]]):
+        """ Dumps any header mapping (e.g. requests' case-insensitive one) as
+        a plain dict. """
+        return dict(headers) if headers is not None else None
 
 
 class NipcResponse(BaseModel, Generic[T_co]):
@@ -132,7 +149,7 @@ class NipcResponse(BaseModel, Generic[T_co]):
         return self.error is not None or (self.http is not None and self.http.status_code >= 400)
 
 
-@dataclass
+@dataclass(slots=True)
 class HttpResponse(Generic[T_co]):
     """ class HttpResponse """
 
@@ -148,14 +165,14 @@ class ValueResponse(SuccessResponse):
 
 class BleDiscoverServices(BaseModel):
     """ Represents BLE service collection. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     services: list[BleService]
 
 
 class BleDiscoverProtocolInformation(BaseModel):
     """ Represents protocol information for BLE. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     ble: BleDiscoverServices
 
@@ -165,7 +182,7 @@ class BleDiscoverResponse(SuccessResponse):
     and characteristics. It includes a list of services.
     """
 
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     protocol_information: BleDiscoverProtocolInformation
 
@@ -197,6 +214,13 @@ class PropertyResponse(SuccessResponse):
     property: str = Field(alias=str("property"))
     value: Base64Bytes
 
+class EncodedPropertyResponse(SuccessResponse):
+    """ Represents a response for a property, with the value left
+    base64-encoded as sent by the gateway. """
+
+    property: str = Field(alias=str("property"))
+    value: str
+
 class PropertyWriteResponse(SuccessResponse):
     """ Represents a response for a property write. """
 
@@ -225,7 +249,7 @@ class Event(BaseModel):
 
 class MqttBrokerConfig(BaseModel):
     """ Represents the MQTT broker configuration. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     uri: str = Field(alias=str("URI"))
     username: str
@@ -235,7 +259,7 @@ class MqttBrokerConfig(BaseModel):
 
 class DataAppRegistration(SuccessResponse):
     """ Represents a response for data app registration. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     events: List[Event]
 
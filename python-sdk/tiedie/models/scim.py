@@ -13,8 +13,9 @@ methods for serialization and deserialization from JSON.
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
-from pydantic.alias_generators import to_camel
+from pydantic import BaseModel, Field, computed_field
+
+from tiedie.models.common import _CAMEL_CONFIG
 
 
 class NullPairing(BaseModel):
@@ -33,7 +34,7 @@ class PairingPassKey(BaseModel):
 
 class PairingOOB(BaseModel):
     """ Represents Out-of-Band Pairing with keys and numbers. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     key: str
     random_number: str
@@ -42,7 +43,7 @@ class PairingOOB(BaseModel):
 
 class BleExtension(BaseModel):
     """ Contains BLE extension data and initialization method. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     version_support: List[str]
     device_mac_address: str
@@ -89,7 +90,7 @@ class BleExtension(BaseModel):
 
 class DppExtension(BaseModel):
     """ Represents DPP extension data. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     dpp_version: int
     bootstrapping_method: List[str]
@@ -101,7 +102,7 @@ class DppExtension(BaseModel):
 
 class ZigbeeExtension(BaseModel):
     """ Represents Zigbee extension data. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     version_support: List[str]
     device_eui64_address: str
@@ -116,7 +117,7 @@ class EndpointAppType(str, Enum):
 class AppCertificateInfo(BaseModel):
     """ Stores information about an application certificate. """
 
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     root_ca: str = Field(alias=str("rootCA"))
     subject_name: str = Field(alias=str("subjectName"))
@@ -124,7 +125,7 @@ class AppCertificateInfo(BaseModel):
 
 class EndpointApp(BaseModel):
     """ Stores information about an endpoint application. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     schemas: list[str] = ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"]
 
@@ -143,7 +144,7 @@ class Application(BaseModel):
 
 class EndpointAppsExtension(BaseModel):
     """ Contains a list of endpoint applications. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     applications: List[Application]
     device_control_enterprise_endpoint: Optional[str] = None
@@ -152,7 +153,7 @@ class EndpointAppsExtension(BaseModel):
 
 class Device(BaseModel):
     """ Represents a device with extensions and schema handling. """
-    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+    model_config = _CAMEL_CONFIG
 
     device_id: Optional[str] = Field(alias=str("id"), default=None)
     display_name: str
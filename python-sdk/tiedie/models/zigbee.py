@@ -19,9 +19,12 @@ from tiedie.models.common import DataParameter
 from tiedie.models.responses import SuccessResponse
 
 
+_ZIGBEE_CONFIG = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+
+
 class Attribute(BaseModel):
     """ Stores attribute information with an ID and type. """
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     attribute_id: int
     attribute_type: int
@@ -29,7 +32,7 @@ class Attribute(BaseModel):
 
 class Cluster(BaseModel):
     """ Represents clusters with an ID and a list of attributes. """
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     cluster_id: int
     attributes: list[Attribute]
@@ -37,7 +40,7 @@ class Cluster(BaseModel):
 
 class Endpoint(BaseModel):
     """ Represents endpoints with an ID and a list of clusters. """
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     endpoint_id: int
     clusters: list[Cluster]
@@ -45,7 +48,7 @@ class Endpoint(BaseModel):
 
 class ZigbeeReadRequest(BaseModel):
     """ Request to read Zigbee data from specific attributes. """
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     endpoint_id: Optional[int] = None
     cluster_id: Optional[int] = None
@@ -55,7 +58,7 @@ class ZigbeeReadRequest(BaseModel):
 
 class ZigbeeWriteRequest(BaseModel):
     """ Request to write data to Zigbee attributes. """
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     endpoint_id: int
     cluster_id: int
@@ -74,7 +77,7 @@ class ZigbeeDataParameter(DataParameter):
 
 class ZigbeeDiscoverResponse(SuccessResponse):
     """ Response containing discovered Zigbee endpoint data. """
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     endpoints: List[Endpoint]
 
@@ -99,7 +102,7 @@ class ZigbeeDiscoverResponse(SuccessResponse):
 class ZigbeeRegisterTopicRequest(BaseModel):
     """ Request to unsubscribe from Zigbee attribute changes. """
 
-    model_config = ConfigDict(populate_by_name=False, alias_generator=to_camel)
+    model_config = _ZIGBEE_CONFIG
 
     endpoint_id: int = Field(alias="endpointID")
     cluster_id: int = Field(alias="clusterID")
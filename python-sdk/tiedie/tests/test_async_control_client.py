@@ -0,0 +1,91 @@
+# Copyright (c) 2023, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+""" Test Async Control Client """
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+import responses
+
+from tiedie.api.async_control_client import AsyncControlClient
+from tiedie.api.auth import ApiKeyAuthenticator
+from tiedie.models.scim import Device
+
+
+@pytest.fixture(name="mock_server")
+def mocked_responses():
+    """Mocked responses fixture"""
+    with responses.RequestsMock() as rsps:
+        yield rsps
+
+
+@pytest.fixture(name="authenticator")
+def api_key_authenticator():
+    """API Key Authenticator fixture"""
+    return ApiKeyAuthenticator(
+        app_id="control_app",
+        ca_file_path="client_ca_path",
+        api_key=str(uuid4())
+    )
+
+
+def test_read_concurrently(mock_server: responses.RequestsMock,
+                           authenticator: ApiKeyAuthenticator):
+    """ Test reads on several devices awaited together """
+
+    device_ids = [str(uuid4()) for _ in range(5)]
+
+    for i, device_id in enumerate(device_ids):
+        mock_server.post(
+            f"https://control.example.com/nipc/extensions/{device_id}/properties/read",
+            body=json.dumps({"value": f"{i:08d}"}),
+            status=200,
+            content_type="application/nipc+json",
+        )
+
+    async def read_all():
+        async with AsyncControlClient("https://control.example.com/nipc",
+                                      authenticator) as control_client:
+            return await asyncio.gather(*[
+                control_client.read(
+                    Device(display_name="BLE Monitor", active=False, device_id=device_id),
+                    service_id="1800",
+                    characteristic_id="2a00"
+                )
+                for device_id in device_ids
+            ])
+
+    results = asyncio.run(read_all())
+
+    assert [r.body.value for r in results if r.body] == \
+        [f"{i:08d}" for i in range(len(device_ids))]
+
+
+def test_get_all_events(mock_server: responses.RequestsMock,
+                        authenticator: ApiKeyAuthenticator):
+    """ Test get all events """
+
+    device_id = str(uuid4())
+
+    mock_server.get(
+        f"https://control.example.com/nipc/devices/{device_id}/events",
+        body=json.dumps([]),
+        status=200,
+        content_type="application/nipc+json",
+    )
+
+    async def get_events():
+        async with AsyncControlClient("https://control.example.com/nipc",
+                                      authenticator) as control_client:
+            return await control_client.get_all_events(device_id)
+
+    response = asyncio.run(get_events())
+
+    assert response.http and response.http.status_code == 200
+    assert response.body is not None
+    assert response.body.root == []
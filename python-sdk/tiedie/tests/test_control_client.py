@@ -5,8 +5,12 @@
 
 """ Test Control Client """
 
+import functools
+import itertools
 import json
+from typing import Callable
 import urllib.parse as url_parse
+from unittest import mock
 from uuid import uuid4
 
 import pytest
@@ -17,20 +21,129 @@ from tiedie.api.auth import ApiKeyAuthenticator, CertificateAuthenticator
 from tiedie.api.control_client import ControlClient
 from tiedie.models.ble import BleDataParameter
 from tiedie.models.requests import SdfModel
-from tiedie.models.responses import DataAppRegistration, Event
+from tiedie.models.responses import DataAppRegistration, Event, NipcProblemTypes
 from tiedie.models.scim import (BleExtension, Device, PairingJustWorks,
                                 PairingPassKey)
 
+_PROPERTY_REF = "https://example.com/thermometer#/sdfObject/healthsensor/sdfProperty/temperature"
+_ENCODED_PROPERTY_REF = url_parse.quote(_PROPERTY_REF)
+_EVENT_REF = "https://example.com/thermometer#/sdfObject/healthsensor/sdfEvent/isPresent"
+_ENCODED_EVENT_REF = url_parse.quote(_EVENT_REF)
+
+# Compact JSON, as the gateway sends it
+_dumps = functools.partial(json.dumps, separators=(',', ':'))
+
+_ids = itertools.count()
+
+
+def _fake_id() -> str:
+    """ Unique uuid-shaped id; the ids are opaque to the client """
+    return f"00000000-0000-0000-0000-{next(_ids):012d}"
+
+
+# Fixed round count per benchmark; a registered mock route answers every round
+_BENCHMARK_ROUNDS = 50
+
+_BLE_VERSIONS = ("4.1", "4.2", "5.0", "5.1", "5.2", "5.3")
+_PASS_KEY = PairingPassKey(key=123456)
+
+# BLE services of a connect/discover response
+_BLE_SERVICES = {
+    "protocolInformation": {
+        "ble": {
+            "services": [
+                {
+                    "serviceID": "1800",
+                    "characteristics": [
+                        {
+                            "characteristicID": "2a00",
+                            "flags": [
+                                "read",
+                                "write"
+                            ],
+                            "descriptors": [
+                                {
+                                    "descriptorID": "2a10"
+                                }
+                            ]
+                        },
+                        {
+                            "characteristicID": "2a01",
+                            "flags": [
+                                "read"
+                            ],
+                            "descriptors": [
+                                {
+                                    "descriptorID": "2a11"
+                                }
+                            ]
+                        },
+                        {
+                            "characteristicID": "2a04",
+                            "flags": [
+                                "read",
+                                "notify"
+                            ],
+                            "descriptors": [
+                                {
+                                    "descriptorID": "2a14"
+                                }
+                            ]
+                        },
+                        {
+                            "characteristicID": "2aa6",
+                            "flags": [
+                                "read"
+                            ],
+                            "descriptors": [
+                                {
+                                    "descriptorID": "2a16"
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+}
+_BLE_SERVICES_BODY = _dumps(_BLE_SERVICES)
+
+# Body of the default connect/discover request (no services/bonding)
+_CONNECT_MATCHER = matchers.json_params_matcher({
+    "protocolInformation": {
+        "ble": {}
+    },
+    "retries": 3,
+})
+
+# (service_id, characteristic_id, flags) parsed from _BLE_SERVICES_BODY
+_EXPECTED_BLE_PARAMETERS = (
+    ("1800", "2a00", ["read", "write"]),
+    ("1800", "2a01", ["read"]),
+    ("1800", "2a04", ["read", "notify"]),
+    ("1800", "2aa6", ["read"]),
+)
+
+
+@pytest.fixture(name="requests_mock", scope="module")
+def fixture_requests_mock():
+    """ One patched requests transport for the whole module """
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
 
 @pytest.fixture(name="mock_server")
-def mocked_responses():
+def mocked_responses(requests_mock: responses.RequestsMock):
     """Mocked responses fixture"""
-    with responses.RequestsMock() as rsps:
-        yield rsps
+    yield requests_mock
+    unfired = [r.url for r in requests_mock.registered() if not r.call_count]
+    requests_mock.reset()
+    assert not unfired, f"Mocked requests not fired: {unfired}"
 
 
-@pytest.fixture(scope="module")
-def api_key_authenticator():
+@pytest.fixture(name="api_key_authenticator", scope="module")
+def fixture_api_key_authenticator():
     """API Key Authenticator fixture"""
     return ApiKeyAuthenticator(
         app_id="onboarding_app",
@@ -49,303 +162,174 @@ def certificate_authenticator():
     )
 
 
-@pytest.fixture(name="control_client",
-                scope="module",
-                params=['api_key_authenticator', 'certificate_authenticator'])
-def mock_control_client(request: pytest.FixtureRequest):
-    """ Mocked control client """
+@pytest.fixture(name="control_client", scope="module")
+def mock_control_client(api_key_authenticator: ApiKeyAuthenticator):
+    """ Mocked control client; the authenticator does not change request
+    and response shaping, see test_authenticators for both kinds """
     return ControlClient(
         base_url="https://control.example.com/nipc",
-        authenticator=request.getfixturevalue(request.param)
+        authenticator=api_key_authenticator
     )
 
 
-def test_connect(mock_server: responses.RequestsMock,
-                 control_client: ControlClient):
-    """ Test connect """
-
-    device_id = str(uuid4())
-
-    body = json.dumps({
-        "id": device_id,
-        "protocolInformation": {
-            "ble": {
-                "services": [
-                    {
-                        "serviceID": "1800",
-                        "characteristics": [
-                            {
-                                "characteristicID": "2a00",
-                                "flags": [
-                                    "read",
-                                    "write"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a10"
-                                    }
-                                ]
-                            },
-                            {
-                                "characteristicID": "2a01",
-                                "flags": [
-                                    "read"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a11"
-                                    }
-                                ]
-                            },
-                            {
-                                "characteristicID": "2a04",
-                                "flags": [
-                                    "read",
-                                    "notify"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a14"
-                                    }
-                                ]
-                            },
-                            {
-                                "characteristicID": "2aa6",
-                                "flags": [
-                                    "read"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a16"
-                                    }
-                                ]
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-    }, separators=(',', ':'))
-
-    # Only mock the default connect request (no services/bonding)
-    mock_server.post(
-        f"https://control.example.com/nipc/devices/{device_id}/connections",
-        body=body,
-        status=200,
-        match=[
-            matchers.json_params_matcher({
-                "protocolInformation": {
-                    "ble": {}
-                },
-                "retries": 3,
-            }),
-        ],
-        content_type="application/nipc+json",
-    )
-
-    device = Device(
+@pytest.fixture(name="device_factory", scope="module")
+def fixture_device_factory():
+    """ Builds BLE devices by copying a validated template, so only the
+    device_id differs and nothing is validated again """
+    template = Device(
         display_name="BLE Monitor",
         active=False,
-        device_id=device_id,
         ble_extension=BleExtension(
             device_mac_address="AA:BB:CC:11:22:33",
             is_random=False,
-            version_support=["4.1", "4.2", "5.0", "5.1", "5.2", "5.3"],
-            pairing_pass_key=PairingPassKey(key=123456),
+            version_support=_BLE_VERSIONS,
+            pairing_pass_key=_PASS_KEY,
             pairing_just_works=PairingJustWorks(key=0),
         )
     )
 
-    response = control_client.connect(device)
+    def build(device_id: str) -> Device:
+        return template.model_copy(update={"device_id": device_id})
+
+    return build
+
+
+@pytest.mark.parametrize("authenticator",
+                         ['api_key_authenticator', 'certificate_authenticator'])
+def test_authenticators(mock_server: responses.RequestsMock,
+                        request: pytest.FixtureRequest,
+                        authenticator: str):
+    """ Test a request round trip with each kind of authenticator """
+
+    device_id = _fake_id()
+
+    mock_server.post(
+        f"https://control.example.com/nipc/extensions/{device_id}/properties/read",
+        body=_dumps({"value": "00001111"}),
+        status=200,
+        content_type="application/nipc+json",
+    )
+
+    with ControlClient(
+        base_url="https://control.example.com/nipc",
+        authenticator=request.getfixturevalue(authenticator)
+    ) as control_client:
+        response = control_client.read(
+            Device(display_name="BLE Monitor", active=False, device_id=device_id),
+            service_id="1800",
+            characteristic_id="2a00"
+        )
 
     assert response.http and response.http.status_code == 200
-    # Check if response is successful, body must be present for success
-    if response.is_success:
-        assert response.body is not None
-        assert isinstance(response.body[0], BleDataParameter)
-        assert isinstance(response.body[1], BleDataParameter)
-        assert isinstance(response.body[2], BleDataParameter)
-        assert isinstance(response.body[3], BleDataParameter)
-        assert response.body[0].service_id == "1800"
-        assert response.body[0].characteristic_id == "2a00"
-        assert response.body[0].flags == ["read", "write"]
-        assert response.body[1].service_id == "1800"
-        assert response.body[1].characteristic_id == "2a01"
-        assert response.body[1].flags == ["read"]
-        assert response.body[2].service_id == "1800"
-        assert response.body[2].characteristic_id == "2a04"
-        assert response.body[2].flags == ["read", "notify"]
-        assert response.body[3].service_id == "1800"
-        assert response.body[3].characteristic_id == "2aa6"
-        assert response.body[3].flags == ["read"]
-    else:
-        assert response.body is None
+    assert response.body is not None
+    assert response.body.value == "00001111"
 
+    sent_api_key = mock_server.calls[0].request.headers.get(
+        ApiKeyAuthenticator.API_KEY_HEADER)
+    if authenticator == 'api_key_authenticator':
+        assert sent_api_key == request.getfixturevalue(authenticator).api_key
+    else:
+        assert sent_api_key is None
 
-def test_disconnect(mock_server: responses.RequestsMock,
-                    control_client: ControlClient):
-    """ Test disconnect """
 
-    device_id = str(uuid4())
+@pytest.mark.parametrize("method,verb", [("connect", "POST"), ("discover", "PUT")])
+def test_connect_or_discover(mock_server: responses.RequestsMock,
+                             control_client: ControlClient,
+                             device_factory: Callable[[str], Device],
+                             benchmark,
+                             method: str,
+                             verb: str):
+    """ Test connect (POST) and discover (PUT) on the /connections endpoint """
 
-    body = json.dumps({
-        "id": device_id
-    }, separators=(',', ':'))
+    device_id = _fake_id()
 
-    mock_server.delete(
+    # Only mock the default connect request (no services/bonding)
+    mock_server.add(
+        verb,
         f"https://control.example.com/nipc/devices/{device_id}/connections",
-        body=body,
+        body=_BLE_SERVICES_BODY,
         status=200,
+        match=[_CONNECT_MATCHER],
         content_type="application/nipc+json",
     )
 
-    device = Device(
-        display_name="BLE Monitor",
-        active=False,
-        device_id=device_id,
-        ble_extension=BleExtension(
-            device_mac_address="AA:BB:CC:11:22:33",
-            is_random=False,
-            version_support=["4.1", "4.2", "5.0", "5.1", "5.2", "5.3"],
-            pairing_pass_key=PairingPassKey(key=123456)
-        )
-    )
+    device = device_factory(device_id)
 
-    response = control_client.disconnect(device)
+    response = benchmark.pedantic(
+        getattr(control_client, method),
+        args=(device,),
+        rounds=_BENCHMARK_ROUNDS,
+        iterations=1)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
+    assert response.is_success
+    assert response.body is not None
+    assert len(response.body) == len(_EXPECTED_BLE_PARAMETERS)
+    for got, expected in zip(response.body, _EXPECTED_BLE_PARAMETERS):
+        assert isinstance(got, BleDataParameter)
+        assert (got.service_id, got.characteristic_id, got.flags) == expected
 
 
-def test_discovery(mock_server: responses.RequestsMock,
-                   control_client: ControlClient):
-    """ Test Discovery """
+def test_connect_failure(mock_server: responses.RequestsMock,
+                         control_client: ControlClient,
+                         device_factory: Callable[[str], Device]):
+    """ Test connect when the gateway fails """
 
-    device_id = str(uuid4())
+    device_id = _fake_id()
 
-    body = json.dumps({
-        "protocolInformation": {
-            "ble": {
-                "services": [
-                    {
-                        "serviceID": "1800",
-                        "characteristics": [
-                            {
-                                "characteristicID": "2a00",
-                                "flags": [
-                                    "read",
-                                    "write"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a10"
-                                    }
-                                ]
-                            },
-                            {
-                                "characteristicID": "2a01",
-                                "flags": [
-                                    "read"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a11"
-                                    }
-                                ]
-                            },
-                            {
-                                "characteristicID": "2a04",
-                                "flags": [
-                                    "read",
-                                    "notify"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a14"
-                                    }
-                                ]
-                            },
-                            {
-                                "characteristicID": "2aa6",
-                                "flags": [
-                                    "read"
-                                ],
-                                "descriptors": [
-                                    {
-                                        "descriptorID": "2a16"
-                                    }
-                                ]
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-    }, separators=(',', ':'))
+    mock_server.post(
+        f"https://control.example.com/nipc/devices/{device_id}/connections",
+        json={"message": "Gateway unavailable"},
+        status=500,
+    )
 
-    # Discovery uses PUT and /connections endpoint
-    mock_server.put(
+    response = control_client.connect(device_factory(device_id), retries=0)
+
+    assert response.http and response.http.status_code == 500
+    assert not response.is_success
+    assert response.body is None
+    assert response.error is not None
+    assert response.error.detail == "Gateway unavailable"
+
+
+def test_disconnect(mock_server: responses.RequestsMock,
+                    control_client: ControlClient,
+                    device_factory: Callable[[str], Device]):
+    """ Test disconnect """
+
+    device_id = _fake_id()
+
+    body = _dumps({
+        "id": device_id
+    })
+
+    mock_server.delete(
         f"https://control.example.com/nipc/devices/{device_id}/connections",
         body=body,
         status=200,
-        match=[
-            matchers.json_params_matcher({
-                "protocolInformation": {
-                    "ble": {}
-                },
-                "retries": 3
-            }),
-        ],
         content_type="application/nipc+json",
     )
 
-    device = Device(
-        display_name="BLE Monitor",
-        active=False,
-        device_id=device_id,
-        ble_extension=BleExtension(
-            device_mac_address="AA:BB:CC:11:22:33",
-            is_random=False,
-            version_support=["4.1", "4.2", "5.0", "5.1", "5.2", "5.3"],
-            pairing_pass_key=PairingPassKey(key=123456)
-        )
-    )
+    device = device_factory(device_id)
 
-    response = control_client.discover(device)
+    response = control_client.disconnect(device)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert isinstance(response.body[0], BleDataParameter)
-        assert isinstance(response.body[1], BleDataParameter)
-        assert isinstance(response.body[2], BleDataParameter)
-        assert isinstance(response.body[3], BleDataParameter)
-        assert response.body[0].service_id == "1800"
-        assert response.body[0].characteristic_id == "2a00"
-        assert response.body[0].flags == ["read", "write"]
-        assert response.body[1].service_id == "1800"
-        assert response.body[1].characteristic_id == "2a01"
-        assert response.body[1].flags == ["read"]
-        assert response.body[2].service_id == "1800"
-        assert response.body[2].characteristic_id == "2a04"
-        assert response.body[2].flags == ["read", "notify"]
-        assert response.body[3].service_id == "1800"
-        assert response.body[3].characteristic_id == "2aa6"
-        assert response.body[3].flags == ["read"]
-    else:
-        assert response.body is None
+    assert response.is_success
+    assert response.body is not None
 
 
 def test_read(mock_server: responses.RequestsMock,
-              control_client: ControlClient):
+              control_client: ControlClient,
+              device_factory: Callable[[str], Device],
+              benchmark):
     """ Test read """
 
-    device_id = str(uuid4())
+    device_id = _fake_id()
 
-    body = json.dumps({
+    body = _dumps({
         "value": "00001111"
-    }, separators=(',', ':'))
+    })
 
     # Remove 'id' from expected request body
     mock_server.post(
@@ -365,38 +349,32 @@ def test_read(mock_server: responses.RequestsMock,
         content_type="application/nipc+json",
     )
 
-    device = Device(
-        display_name="BLE Monitor",
-        active=False,
-        device_id=device_id,
-        ble_extension=BleExtension(
-            device_mac_address="AA:BB:CC:11:22:33",
-            is_random=False,
-            version_support=["4.1", "4.2", "5.0", "5.1", "5.2", "5.3"],
-            pairing_pass_key=PairingPassKey(key=123456)
-        )
-    )
+    device = device_factory(device_id)
 
-    response = control_client.read(device,
-        service_id="1800",
-        characteristic_id="2a00"
-    )
+    response = benchmark.pedantic(
+        control_client.read,
+        args=(device,),
+        kwargs={"service_id": "1800", "characteristic_id": "2a00"},
+        rounds=_BENCHMARK_ROUNDS,
+        iterations=1)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert response.body.value == "00001111"
+    assert response.is_success
+    assert response.body is not None
+    assert response.body.value == "00001111"
 
 
 def test_write(mock_server: responses.RequestsMock,
-               control_client: ControlClient):
+               control_client: ControlClient,
+               device_factory: Callable[[str], Device],
+               benchmark):
     """ Test write """
 
-    device_id = str(uuid4())
+    device_id = _fake_id()
 
-    body = json.dumps({
+    body = _dumps({
         "value": "00001111"
-    }, separators=(',', ':'))
+    })
 
     # Remove 'id' from expected request body
     mock_server.post(
@@ -417,28 +395,19 @@ def test_write(mock_server: responses.RequestsMock,
         content_type="application/nipc+json",
     )
 
-    device = Device(
-        display_name="BLE Monitor",
-        active=False,
-        device_id=device_id,
-        ble_extension=BleExtension(
-            device_mac_address="AA:BB:CC:11:22:33",
-            is_random=False,
-            version_support=["4.1", "4.2", "5.0", "5.1", "5.2", "5.3"],
-            pairing_pass_key=PairingPassKey(key=123456)
-        )
-    )
+    device = device_factory(device_id)
 
-    response = control_client.write(
-        device,
-        service_id="1800",
-        characteristic_id="2a00",
-        value="00001111")
+    response = benchmark.pedantic(
+        control_client.write,
+        args=(device,),
+        kwargs={"service_id": "1800", "characteristic_id": "2a00", "value": "00001111"},
+        rounds=_BENCHMARK_ROUNDS,
+        iterations=1)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert response.body.value == "00001111"
+    assert response.is_success
+    assert response.body is not None
+    assert response.body.value == "00001111"
 
 
 def test_register_sdf_model(mock_server: responses.RequestsMock, control_client: ControlClient):
@@ -464,9 +433,9 @@ def test_register_sdf_model(mock_server: responses.RequestsMock, control_client:
             }
         }
     }
-    body = json.dumps([{
+    body = _dumps([{
         "sdfName": "https://example.com/thermometer#/sdfObject/healthsensor"
-    }], separators=(',', ':'))
+    }])
     mock_server.post(
         "https://control.example.com/nipc/registrations/models",
         body=body,
@@ -478,53 +447,59 @@ def test_register_sdf_model(mock_server: responses.RequestsMock, control_client:
     response = control_client.register_sdf_model(sdf_model)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert len(response.body.root) == 1
-        expected_sdf_name = "https://example.com/thermometer#/sdfObject/healthsensor"
-        assert response.body.root[0].sdf_name == expected_sdf_name
-
-
-def test_property_read_api(mock_server: responses.RequestsMock, control_client: ControlClient):
+    assert response.is_success
+    assert response.body is not None
+    assert len(response.body.root) == 1
+    expected_sdf_name = "https://example.com/thermometer#/sdfObject/healthsensor"
+    assert response.body.root[0].sdf_name == expected_sdf_name
+
+
+@pytest.mark.parametrize("decode,expected_value", [(True, b"test"), (False, "dGVzdA==")])
+def test_property_read_api(mock_server: responses.RequestsMock,
+                           control_client: ControlClient,
+                           benchmark,
+                           decode: bool,
+                           expected_value):
     """Test reading a property using the property API"""
-    device_id = str(uuid4())
-    property_ref = "https://example.com/thermometer#/sdfObject/healthsensor/sdfProperty/temperature"
-    body = json.dumps([{
-        "property": property_ref,
+    device_id = _fake_id()
+    body = _dumps([{
+        "property": _PROPERTY_REF,
         "value": "dGVzdA=="
-    }], separators=(',', ':'))
-    encoded_property_ref = url_parse.quote(property_ref)
+    }])
     mock_server.get(
         f"https://control.example.com/nipc/devices/{device_id}/properties"
-        f"?propertyName={encoded_property_ref}",
+        f"?propertyName={_ENCODED_PROPERTY_REF}",
         body=body,
         status=200,
         content_type="application/nipc+json",
     )
-    response = control_client.read_property(device_id, property_ref)
+    response = benchmark.pedantic(
+        control_client.read_property,
+        args=(device_id, _PROPERTY_REF, decode),
+        rounds=_BENCHMARK_ROUNDS,
+        iterations=1)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert len(response.body.root) == 1
-        assert response.body.root[0].property == property_ref
-        assert response.body.root[0].value == b"test"
+    assert response.is_success
+    assert response.body is not None
+    assert len(response.body.root) == 1
+    assert response.body.root[0].property == _PROPERTY_REF
+    assert response.body.root[0].value == expected_value
 
 
 def test_property_write_api(mock_server: responses.RequestsMock, control_client: ControlClient):
     """Test writing a property using the property API"""
-    device_id = str(uuid4())
-    property_ref = "https://example.com/thermometer#/sdfObject/healthsensor/sdfProperty/temperature"
+    device_id = _fake_id()
     value = "dGVzdA=="
     req_body = [
         {
-            "property": property_ref,
+            "property": _PROPERTY_REF,
             "value": value
         }
     ]
-    resp_body = json.dumps([{
+    resp_body = _dumps([{
         "status": 200
-    }], separators=(',', ':'))
+    }])
     mock_server.put(
         f"https://control.example.com/nipc/devices/{device_id}/properties",
         body=resp_body,
@@ -532,24 +507,23 @@ def test_property_write_api(mock_server: responses.RequestsMock, control_client:
         match=[matchers.json_params_matcher(req_body)],
         content_type="application/nipc+json",
     )
-    response = control_client.write_property(device_id, property_ref, value)
+    response = control_client.write_property(device_id, _PROPERTY_REF, value)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert len(response.body.root) == 1
-        assert response.body.root[0].status == 200
+    assert response.is_success
+    assert response.body is not None
+    assert len(response.body.root) == 1
+    assert response.body.root[0].status == 200
 
 
 def test_register_data_app(mock_server: responses.RequestsMock, control_client: ControlClient):
     """Test registering a data app"""
-    data_app_id = str(uuid4())
-    event_ref = "https://example.com/thermometer#/sdfObject/healthsensor/sdfEvent/isPresent"
+    data_app_id = _fake_id()
     req_body = {
-        "events": [{"event": event_ref}],
+        "events": [{"event": _EVENT_REF}],
         "mqttClient": True
     }
-    resp_body = json.dumps(req_body, separators=(',', ':'))
+    resp_body = _dumps(req_body)
     mock_server.post(
         f"https://control.example.com/nipc/registrations/data-apps?dataAppId={data_app_id}",
         body=resp_body,
@@ -558,32 +532,30 @@ def test_register_data_app(mock_server: responses.RequestsMock, control_client:
         content_type="application/nipc+json",
     )
     data_app = DataAppRegistration(
-        events=[Event(event=event_ref)],
+        events=[Event(event=_EVENT_REF)],
         mqtt_client=True,
     )
     response = control_client.create_data_app(data_app_id, data_app)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body is not None
-        assert response.body.events[0].event == event_ref
-        assert response.body.mqtt_client is True
+    assert response.is_success
+    assert response.body is not None
+    assert response.body.events[0].event == _EVENT_REF
+    assert response.body.mqtt_client is True
 
 
 def test_enable_event(mock_server: responses.RequestsMock, control_client: ControlClient):
     """Test enabling an event"""
-    device_id = str(uuid4())
-    event_ref = "https://example.com/thermometer#/sdfObject/healthsensor/sdfEvent/isPresent"
-    instance_id = str(uuid4())
+    device_id = _fake_id()
+    instance_id = _fake_id()
 
-    encoded_event_ref = url_parse.quote(event_ref)
     location_header = (
         f"https://control.example.com/nipc/devices/{device_id}/events"
         f"?instanceId={instance_id}"
     )
     post_url = (
         f"https://control.example.com/nipc/devices/{device_id}/events"
-        f"?eventName={encoded_event_ref}"
+        f"?eventName={_ENCODED_EVENT_REF}"
     )
     mock_server.post(
         post_url,
@@ -592,8 +564,125 @@ def test_enable_event(mock_server: responses.RequestsMock, control_client: Contr
         headers={"Location": location_header},
         content_type="application/nipc+json",
     )
-    response = control_client.enable_event(device_id, event_ref)
+    response = control_client.enable_event(device_id, _EVENT_REF)
 
     assert response.http and response.http.status_code == 200
-    if response.is_success:
-        assert response.body == instance_id
+    assert response.is_success
+    assert response.body == instance_id
+
+
+def test_enable_event_error(mock_server: responses.RequestsMock, control_client: ControlClient):
+    """Test enabling an event on an unknown device"""
+    device_id = _fake_id()
+
+    mock_server.post(
+        f"https://control.example.com/nipc/devices/{device_id}/events"
+        f"?eventName={_ENCODED_EVENT_REF}",
+        json={"type": "about:blank", "status": 404, "title": "Device not found"},
+        status=404,
+        content_type="application/problem+json",
+    )
+    response = control_client.enable_event(device_id, _EVENT_REF)
+
+    assert response.http and response.http.status_code == 404
+    assert response.body is None
+    assert response.error is not None
+    assert response.error.type_enum == NipcProblemTypes.ABOUT_BLANK
+
+
+def test_unregistered_problem_type(mock_server: responses.RequestsMock,
+                                   control_client: ControlClient):
+    """Test an error whose problem type is outside the NIPC registry"""
+    device_id = _fake_id()
+    problem_type = "https://gateway.example.com/problems/device-busy"
+
+    mock_server.get(
+        f"https://control.example.com/nipc/devices/{device_id}/events",
+        json={"type": problem_type, "status": 409, "title": "Device busy"},
+        status=409,
+        content_type="application/problem+json",
+    )
+    response = control_client.get_all_events(device_id)
+
+    assert response.error is not None
+    assert response.error.type == problem_type
+    assert response.error.title == "Device busy"
+    assert response.error.type_enum is None
+
+
+def test_context_manager_closes_session(api_key_authenticator: ApiKeyAuthenticator):
+    """ Test that leaving the with block closes the pooled connections """
+
+    control_client = ControlClient(
+        base_url="https://control.example.com/nipc",
+        authenticator=api_key_authenticator
+    )
+
+    with mock.patch.object(control_client.http_client, "close") as close:
+        with control_client:
+            close.assert_not_called()
+        close.assert_called_once()
+
+
+def test_read_many(mock_server: responses.RequestsMock,
+                   control_client: ControlClient):
+    """ Test reading several devices in one batch """
+
+    device_ids = [_fake_id() for _ in range(5)]
+
+    for i, device_id in enumerate(device_ids):
+        mock_server.post(
+            f"https://control.example.com/nipc/extensions/{device_id}/properties/read",
+            body=_dumps({"value": f"{i:08d}"}),
+            status=200,
+            content_type="application/nipc+json",
+        )
+
+    results = control_client.read_many([
+        (Device(display_name="BLE Monitor", active=False, device_id=device_id), "1800", "2a00")
+        for device_id in device_ids
+    ])
+
+    assert [r.body.value for r in results if r.body] == \
+        [f"{i:08d}" for i in range(len(device_ids))]
+
+
+def test_sdf_models_cache(mock_server: responses.RequestsMock,
+                          api_key_authenticator: ApiKeyAuthenticator):
+    """ Test that SDF model listings are cached until a model changes """
+
+    control_client = ControlClient(
+        base_url="https://control.example.com/nipc",
+        authenticator=api_key_authenticator,
+        cache_ttl=60.0
+    )
+    sdf_name = "https://example.com/thermometer#/sdfObject/healthsensor"
+
+    listing = mock_server.get(
+        "https://control.example.com/nipc/registrations/models",
+        json=[{"sdfName": sdf_name}],
+        status=200,
+    )
+    mock_server.delete(
+        "https://control.example.com/nipc/registrations/models"
+        f"?sdfName={url_parse.quote(sdf_name)}",
+        json={"sdfName": sdf_name},
+        status=200,
+        content_type="application/nipc+json",
+    )
+
+    first = control_client.get_sdf_models()
+    second = control_client.get_sdf_models()
+
+    assert first.status_code == 200
+    assert second is not first
+    assert second.body == first.body
+    assert listing.call_count == 1
+
+    second.body.root.clear()
+    assert control_client.get_sdf_models().body == first.body
+
+    control_client.unregister_sdf_model(sdf_name)
+    control_client.get_sdf_models()
+
+    assert listing.call_count == 2
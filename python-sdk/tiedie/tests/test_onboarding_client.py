@@ -15,6 +15,9 @@ from tiedie.models.scim import (
     AppCertificateInfo, BleExtension, Device, EndpointApp, EndpointAppType, PairingPassKey
 )
 
+_BLE_VERSIONS = ("4.1", "4.2", "5.0", "5.1", "5.2", "5.3")
+_PASS_KEY = PairingPassKey(key=123456)
+
 
 @pytest.fixture(name="mock_server")
 def mocked_responses():
@@ -92,8 +95,8 @@ def test_device_creation(mock_server: responses.RequestsMock,
         ble_extension=BleExtension(
             device_mac_address="AA:BB:CC:11:22:33",
             is_random=False,
-            version_support=["4.1", "4.2", "5.0", "5.1", "5.2", "5.3"],
-            pairing_pass_key=PairingPassKey(key=123456)
+            version_support=_BLE_VERSIONS,
+            pairing_pass_key=_PASS_KEY
         )
     )
 